@@ -0,0 +1,362 @@
+"""Headless benchmarks and regression harness for the NumberCore hot paths.
+
+Run:
+  python NumberBench.py                          # all cases at the default sizes
+  python NumberBench.py --sizes 1000 100000 --only sort stats
+  python NumberBench.py --save bench_baseline.json
+  python NumberBench.py --baseline bench_baseline.json --threshold 0.25
+  python NumberBench.py --compare-sum 1000000    # sum() vs exact_sum()
+  python NumberBench.py --check 10000            # kernels vs Decimal/Fraction/brute force
+
+Every case also records a checksum of its result. With --baseline the exit
+status is 1 if any case got slower than the baseline by more than the
+threshold (a fraction, 0.25 == 25%) or its checksum changed. --check runs
+randomized comparisons of the fast integer kernels against slow reference
+implementations and exits 1 on the first disagreements.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal, localcontext, MAX_EMAX, MIN_EMIN
+from fractions import Fraction
+
+from NumberCore import (
+    parse_number, NumberBatch, exact_sum, calculate_stats, sort_numbers,
+    solve_linear_equation, fraction_to_decimal_str, compute_geometry, total_area,
+    parse_polygons, polygon_measures, set_snap,
+    _significant, _simplest_between, _limit_denominator,
+)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+# ---------- synthetic inputs ----------
+def decimals(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.uniform(-1000, 1000):.{rng.randrange(1, 5)}f}" for _ in range(count)]
+
+def percents(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.uniform(0, 200):.2f}%" for _ in range(count)]
+
+def mixed_numbers(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.randrange(-20, 20)} {rng.randrange(1, 16)}/{rng.randrange(16, 32)}" for _ in range(count)]
+
+def huge_fractions(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.getrandbits(200) - (1 << 199)}/{rng.getrandbits(160) | 1}" for _ in range(count)]
+
+def mixed_inputs(count, seed=0):
+    """Return `count` number strings mixing decimals, fractions, percents and mixed numbers."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        kind = rng.randrange(4)
+        if kind == 0:
+            out.append(f"{rng.uniform(-1000, 1000):.{rng.randrange(1, 5)}f}")
+        elif kind == 1:
+            out.append(f"{rng.randrange(-500, 500)}/{rng.randrange(1, 64)}")
+        elif kind == 2:
+            out.append(f"{rng.uniform(0, 200):.2f}%")
+        else:
+            out.append(f"{rng.randrange(-20, 20)} {rng.randrange(1, 16)}/{rng.randrange(16, 32)}")
+    return out
+
+def equations(count, seed=0):
+    rng = random.Random(seed)
+    return [f"{rng.randrange(1, 50)}/{rng.randrange(1, 9)}x + {rng.uniform(-99, 99):.2f} = "
+            f"{rng.randrange(-9, 9)} - {rng.randrange(1, 7)}/{rng.randrange(2, 9)}x"
+            for _ in range(count)]
+
+GEOM_SHAPES = ("Circle", "Square", "Rectangle", "Parallelogram", "Trapezoid",
+               "Triangle Area", "Pythagoras (Hypotenuse)", "Rhombus", "Ellipse",
+               "Sector", "Sphere", "Cylinder", "Cone", "Prism")
+AREA_SHAPES = set(GEOM_SHAPES) - {"Pythagoras (Hypotenuse)", "Sphere", "Cylinder", "Cone", "Prism"}
+
+def geometry_params(count, seed=0):
+    rng = random.Random(seed)
+    return [(GEOM_SHAPES[i % len(GEOM_SHAPES)],
+             f"{rng.uniform(0.1, 100):.3f}", f"{rng.randrange(1, 40)}/{rng.randrange(1, 9)}",
+             f"{rng.uniform(0.1, 100):.2f}")
+            for i in range(count)]
+
+def polygons(count, seed=0, vertices=8):
+    """`count` star-shaped (so simple) polygons as 'x,y; x,y; ...' strings."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        pts = []
+        for k in range(vertices):
+            t = 2 * math.pi * k / vertices
+            r = rng.uniform(1, 50)
+            pts.append(f"{r * math.cos(t):.2f},{r * math.sin(t):.2f}")
+        out.append("; ".join(pts))
+    return out
+
+
+# ---------- benchmark cases ----------
+# each operation returns its result, which run_case() checksums
+def _parse_all(strings):
+    return [parse_number(s) for s in strings]
+
+def _to_decimal_all(fracs):
+    return [fraction_to_decimal_str(f) for f in fracs]
+
+def _solve_all(eqs):
+    return [solve_linear_equation(eq) for eq in eqs]
+
+def _geometry_all(params):
+    return [compute_geometry(sel, p1, p2, p3) for sel, p1, p2, p3 in params]
+
+def _geometry_exact_all(params):
+    return [compute_geometry(sel, p1, p2, p3, exact=True) for sel, p1, p2, p3 in params]
+
+def _format_columns(batch):
+    out = []
+    for spec in ("mixed", "sci", "nearest:16", "decimal:2"):
+        batch.write_formatted(spec, out.append)
+    return out
+
+def _stats_snapped(strings):
+    set_snap(max_den=10**6)
+    try:
+        return calculate_stats(strings)
+    finally:
+        set_snap()
+
+def _polygons_bulk(texts):
+    return polygon_measures(*parse_polygons(texts))
+
+def _total_area(params):
+    rows = [(sel, p1, p2, p3, "cm" if i % 2 else "m")
+            for i, (sel, p1, p2, p3) in enumerate(params) if sel in AREA_SHAPES]
+    # areas without an exact form take the float subtotal path
+    rows += [("Regular Polygon", str(3 + i % 10), p2, "", "cm" if i % 2 else "m")
+             for i, (_, _, p2, _) in enumerate(params[::len(GEOM_SHAPES)])]
+    return total_area(rows, "m")
+
+# name -> (make input for a size, operation timed on that input)
+CASES = {
+    "parse_decimals": (decimals, _parse_all),
+    "parse_percents": (percents, _parse_all),
+    "parse_mixed_numbers": (mixed_numbers, _parse_all),
+    "parse_huge_fractions": (huge_fractions, _parse_all),
+    "stats_mixed": (mixed_inputs, calculate_stats),
+    "stats_huge_fractions": (huge_fractions, calculate_stats),
+    "stats_huge_snapped": (huge_fractions, _stats_snapped),
+    "sort_mixed": (mixed_inputs, sort_numbers),
+    "sort_decimals": (decimals, sort_numbers),
+    "to_decimal_str": (lambda n: [parse_number(s) for s in mixed_inputs(n)], _to_decimal_all),
+    "format_columns": (lambda n: NumberBatch.from_strings(mixed_inputs(n)), _format_columns),
+    "solve_linear": (equations, _solve_all),
+    "geometry": (geometry_params, _geometry_all),
+    "geometry_exact": (geometry_params, _geometry_exact_all),
+    "total_area": (geometry_params, _total_area),
+    "polygons_bulk": (polygons, _polygons_bulk),
+}
+
+
+def checksum(result):
+    """Short hash of a case result (nested lists/tuples of numbers and strings)."""
+    h = hashlib.sha256()
+    _feed(h, result)
+    return h.hexdigest()[:16]
+
+def _feed(h, value):
+    # ints in hex: str() refuses integers beyond sys.get_int_max_str_digits()
+    if isinstance(value, int):
+        h.update(b"i%x;" % value)
+    elif isinstance(value, Fraction):
+        h.update(b"f%x/%x;" % (value.numerator, value.denominator))
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for v in value:
+            _feed(h, v)
+        h.update(b"]")
+    else:
+        h.update(repr(value).encode() + b";")
+
+def run_case(name, size, repeat=3):
+    """Time one case; returns dict with best seconds, items/sec, peak traced bytes and result checksum."""
+    make, op = CASES[name]
+    data = make(size)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        op(data)
+        best = min(best, time.perf_counter() - start)
+    # memory is measured on a separate run; tracing skews the timings
+    tracemalloc.start()
+    try:
+        result = op(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "per_sec": size / best if best else float("inf"), "peak_bytes": peak,
+            "checksum": checksum(result)}
+
+
+def run_suite(names, sizes, repeat=3, out=sys.stdout):
+    results = {}
+    for name in names:
+        for size in sizes:
+            r = run_case(name, size, repeat)
+            results[f"{name}@{size}"] = r
+            print(f"{name:<22} n={size:<8} {r['seconds']:9.4f}s {r['per_sec']:12.0f}/s "
+                  f"{r['peak_bytes'] / 1024:10.1f} KiB", file=out)
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """Return [(key, base_seconds, new_seconds)] for cases slower than baseline*(1+threshold)."""
+    slow = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base and r["seconds"] > base["seconds"] * (1 + threshold):
+            slow.append((key, base["seconds"], r["seconds"]))
+    return slow
+
+def find_mismatches(results, baseline):
+    """Return [(key, base_checksum, new_checksum)] for cases whose result changed."""
+    changed = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base and "checksum" in base and r["checksum"] != base["checksum"]:
+            changed.append((key, base["checksum"], r["checksum"]))
+    return changed
+
+
+# ---------- one-off comparisons ----------
+def bench_sum(count=1_000_000):
+    """Compare builtin sum() over Fractions with exact_sum() on mixed inputs."""
+    values = [parse_number(s) for s in mixed_inputs(count)]
+
+    start = time.perf_counter()
+    expected = sum(values)
+    t_builtin = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = exact_sum(values)
+    t_exact = time.perf_counter() - start
+
+    if got != expected:
+        raise AssertionError("exact_sum disagrees with sum()")
+    print(f"sum() over {count} Fractions: {t_builtin:.3f}s")
+    print(f"exact_sum():                 {t_exact:.3f}s  ({t_builtin / t_exact:.1f}x)")
+
+
+# ---------- correctness checks ----------
+def _check_significant(rng):
+    a = rng.getrandbits(rng.randrange(1, 200)) + 1
+    d = rng.getrandbits(rng.randrange(1, 200)) + 1
+    prec = rng.randrange(1, 60)
+    digits, exp = _significant(a, d, prec)
+    with localcontext() as ctx:
+        ctx.prec, ctx.Emax, ctx.Emin = prec, MAX_EMAX, MIN_EMIN
+        expected = Fraction(Decimal(a) / Decimal(d))
+    got = Fraction(digits) * Fraction(10) ** exp
+    if got != expected or len(str(digits)) != prec:
+        return f"_significant({a}, {d}, {prec}) = {digits}e{exp}, Decimal gives {expected}"
+
+def _check_limit_denominator(rng):
+    n = rng.getrandbits(rng.randrange(1, 120)) * rng.choice((1, -1))
+    d = rng.getrandbits(rng.randrange(1, 120)) + 1
+    max_den = rng.randrange(1, 10 ** rng.randrange(1, 12))
+    expected = Fraction(n, d).limit_denominator(max_den)
+    got = Fraction(*_limit_denominator(*Fraction(n, d).as_integer_ratio(), max_den))
+    if got != expected:
+        return f"_limit_denominator({n}, {d}, {max_den}) = {got}, Fraction gives {expected}"
+
+def _check_simplest_between(rng):
+    low = Fraction(rng.randrange(0, 10 ** 6), rng.randrange(1, 10 ** 4))
+    high = low + Fraction(1, rng.randrange(1, 10 ** 4))
+    p, q = _simplest_between(low.numerator, low.denominator, high.numerator, high.denominator)
+    # brute force: the first denominator with a multiple of 1/q inside, smallest numerator
+    for bq in range(1, q + 1):
+        bp = -(-low.numerator * bq // low.denominator)
+        if Fraction(bp, bq) <= high:
+            break
+    if (p, q) != (bp, bq):
+        return f"_simplest_between({low}, {high}) = {p}/{q}, brute force gives {bp}/{bq}"
+
+def _check_shoelace(rng):
+    texts = polygons(rng.randrange(1, 6), rng.getrandbits(32), rng.randrange(3, 12))
+    if rng.random() < 0.5:
+        texts.append("; ".join(f"{rng.randrange(-50, 50)}/{rng.randrange(1, 9)},{rng.randrange(-50, 50)}"
+                               for _ in range(rng.randrange(3, 8))))
+    areas, perimeters = polygon_measures(*parse_polygons(texts))
+    for text, area, perimeter in zip(texts, areas, perimeters):
+        pts = [tuple(parse_number(c) for c in v.split(',')) for v in text.split(';')]
+        twice = sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1]))
+        edges = math.fsum(math.hypot(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1]))
+        if area != abs(twice) / 2 or not math.isclose(perimeter, edges, rel_tol=1e-12):
+            return f"polygon {text!r}: area {area}, perimeter {perimeter}; expected {abs(twice) / 2}, {edges}"
+
+CHECKS = {
+    "significant": _check_significant,
+    "limit_denominator": _check_limit_denominator,
+    "simplest_between": _check_simplest_between,
+    "shoelace": _check_shoelace,
+}
+
+def run_checks(count, seed=0, out=sys.stdout):
+    """Run `count` random trials of every check; returns the number of failures."""
+    rng = random.Random(seed)
+    failures = 0
+    for name, check in CHECKS.items():
+        failed = 0
+        for _ in range(count):
+            msg = check(rng)
+            if msg:
+                failed += 1
+                if failed <= 5:
+                    print(f"FAIL {name}: {msg}", file=sys.stderr)
+        print(f"{name:<22} {count - failed}/{count} ok", file=out)
+        failures += failed
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="NumberTool benchmark suite")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    ap.add_argument("--only", nargs="+", choices=sorted(CASES), help="run only these cases")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--save", metavar="FILE", help="write results as baseline JSON")
+    ap.add_argument("--baseline", metavar="FILE", help="fail on regressions against this JSON")
+    ap.add_argument("--threshold", type=float, default=0.25)
+    ap.add_argument("--compare-sum", type=int, metavar="N", help="only run the sum() vs exact_sum() comparison")
+    ap.add_argument("--check", type=int, metavar="N", help="only run N random correctness trials per kernel")
+    args = ap.parse_args(argv)
+
+    if args.compare_sum:
+        bench_sum(args.compare_sum)
+        return 0
+    if args.check:
+        return 1 if run_checks(args.check) else 0
+
+    results = run_suite(args.only or list(CASES), args.sizes, args.repeat)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        slow = find_regressions(results, baseline, args.threshold)
+        for key, before, after in slow:
+            print(f"REGRESSION {key}: {before:.4f}s -> {after:.4f}s", file=sys.stderr)
+        changed = find_mismatches(results, baseline)
+        for key, before, after in changed:
+            print(f"RESULT CHANGED {key}: checksum {before} -> {after}", file=sys.stderr)
+        if slow or changed:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
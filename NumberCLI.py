@@ -0,0 +1,285 @@
+"""Headless command-line entry point for the NumberTool operations.
+
+Does not import tkinter. Input comes from the positional arguments, from
+files given with -f, or from stdin; it is read line by line.
+
+  python NumberCLI.py sort 3 1/2 "-3 6/7" 50%
+  python NumberCLI.py sort --desc -f numbers.txt --format csv
+  python NumberCLI.py stats < numbers.txt        # commas and/or newlines
+  python NumberCLI.py convert 0.375 "1 1/4"
+  python NumberCLI.py sqrt 2 9/4
+  python NumberCLI.py exponent "power_of_power,x,2,3"   # rule,base,e1[,e2]
+  python NumberCLI.py solve "2x+3=7"
+  python NumberCLI.py geometry "Rectangle,3,1/2"        # shape,p1[,p2[,p3]]
+  python NumberCLI.py polygon "0,0; 4,0; 4,3" "0,0; 1,0; 0,1"   # one vertex list per line
+  python NumberCLI.py calc "7/2+3"
+  python NumberCLI.py format --spec nearest:16 -f column.txt   # one value per line
+
+sort and stats treat the whole input as one data set; the other commands
+emit one record per input line. Output is JSON Lines (default) or CSV,
+except for format, which writes the formatted values as plain lines
+(specs: fraction, mixed, decimal[:places], percent[:places], sci[:digits],
+nearest:den).
+Bad records are reported in an "error" field and make the exit status 1.
+"""
+import argparse
+import csv
+import json
+import sys
+
+from NumberCore import (
+    parse_number, NumberBatch, fraction_to_decimal_str, fraction_to_percent_str,
+    format_value, compile_format,
+    sqrt_str, rules_map, exponent_rule, exponent_evaluate,
+    solve_linear_equation, compute_geometry, evaluate_expression, set_precision, set_snap,
+    get_precision, geometry_measures, parse_polygons, polygon_measures, measure_str,
+)
+import NumberCache
+
+# persistent results for the costly helpers (NUMBERTOOL_CACHE=1)
+fraction_to_decimal_str = NumberCache.cached("decimal", fraction_to_decimal_str, NumberCache.decimal_key)
+sqrt_str = NumberCache.cached("sqrt", sqrt_str, NumberCache.sqrt_key)
+exponent_evaluate = NumberCache.cached("exponent", exponent_evaluate, NumberCache.exponent_key)
+
+
+# ---------- input ----------
+def iter_lines(args):
+    """Non-blank input lines from the positional values, -f files or stdin."""
+    if args.values:
+        sources = [args.values]
+    elif args.files:
+        sources = (_read_file(path) for path in args.files)
+    else:
+        sources = [sys.stdin]
+    for src in sources:
+        for line in src:
+            line = line.strip()
+            if line:
+                yield line
+
+def _read_file(path):
+    if path == "-":
+        yield from sys.stdin
+        return
+    with open(path, encoding="utf-8") as f:
+        yield from f
+
+def _iter_values(lines):
+    for line in lines:
+        yield from line.split(',')
+
+# what bad input can raise: overflow (e.g. "inf"), too deep nesting, ...
+INPUT_ERRORS = (ValueError, ArithmeticError, RecursionError)
+
+def _fields(line, count):
+    parts = [p.strip() for p in line.split(',')]
+    return parts + [""] * (count - len(parts))
+
+
+# ---------- operations (one record per input line) ----------
+def op_convert(line):
+    frac = parse_number(line)
+    return {"fraction": str(frac), "decimal": fraction_to_decimal_str(frac),
+            "percent": fraction_to_percent_str(frac), "mixed": format_value("mixed", frac),
+            "scientific": format_value("sci", frac)}
+
+def op_sqrt(line):
+    return {"sqrt": sqrt_str(parse_number(line))}
+
+def op_exponent(line):
+    rule, base, e1, e2 = _fields(line, 4)[:4]
+    rule_code = rules_map.get(rule, rule)
+    if rule_code not in rules_map.values():
+        raise ValueError(f"Unknown rule: {rule}")
+    return {"expression": exponent_rule(rule_code, base, e1, e2),
+            "numeric": exponent_evaluate(rule_code, base, e1, e2)}
+
+def op_solve(line):
+    status, msg, sol = solve_linear_equation(line)
+    if status == 'error':
+        raise ValueError(msg)
+    return {"status": status, "message": msg,
+            "solution": "" if sol is None else str(sol),
+            "decimal": "" if sol is None else fraction_to_decimal_str(sol)}
+
+def op_geometry(line):
+    shape, _, vertices = line.partition(',')
+    if shape.strip() == "Polygon (vertices)":  # the vertex list has commas of its own
+        return {"result": compute_geometry(shape.strip(), vertices.strip())}
+    shape, p1, p2, p3 = _fields(line, 4)[:4]
+    result = compute_geometry(shape, p1, p2, p3)
+    if result == "Unknown shape.":
+        raise ValueError(f"Unknown shape: {shape}")
+    return {"result": result}
+
+def op_calc(line):
+    return {"result": str(evaluate_expression(line))}
+
+RECORD_OPS = {
+    "convert": (op_convert, ("fraction", "decimal", "percent", "mixed", "scientific")),
+    "sqrt": (op_sqrt, ("sqrt",)),
+    "exponent": (op_exponent, ("expression", "numeric")),
+    "solve": (op_solve, ("status", "message", "solution", "decimal")),
+    "geometry": (op_geometry, ("result",)),
+    "calc": (op_calc, ("result",)),
+}
+
+
+# ---------- output ----------
+class Writer:
+    """Writes records as JSON Lines or CSV (header from `columns`)."""
+
+    def __init__(self, fmt, columns, out=sys.stdout):
+        self.fmt = fmt
+        self.columns = columns
+        self.out = out
+        if fmt == "csv":
+            self.csv = csv.writer(out, lineterminator="\n")
+            self.csv.writerow(columns)
+
+    def write(self, record):
+        if self.fmt == "csv":
+            self.csv.writerow([record.get(c, "") for c in self.columns])
+        else:
+            self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def run_records(args):
+    op, columns = RECORD_OPS[args.command]
+    writer = Writer(args.format, ("input",) + columns + ("error",))
+    failed = False
+    for line in iter_lines(args):
+        try:
+            record = op(line)
+        except INPUT_ERRORS as e:
+            record = {"error": str(e)}
+            failed = True
+        record = {"input": line, **record}
+        writer.write(record)
+    return 1 if failed else 0
+
+def _polygon_record(line):
+    (_, _, area, _), (_, _, perimeter, _) = geometry_measures("Polygon (vertices)", line)
+    return {"area": measure_str(area), "perimeter": measure_str(perimeter)}
+
+def run_polygon(args):
+    """Area and perimeter per vertex list, all lines in one bulk shoelace call.
+
+    Falls back to line-by-line (to report the bad lines) when the bulk parse
+    fails, and when a precision is set (exact perimeters need the slow path).
+    """
+    writer = Writer(args.format, ("input", "area", "perimeter", "error"))
+    lines = list(iter_lines(args))
+    records = None
+    if get_precision() is None:
+        try:
+            coords, starts, scale = parse_polygons(lines)
+            areas, perimeters = polygon_measures(coords, starts, scale)
+            records = [{"area": measure_str(a), "perimeter": measure_str(p)}
+                       for a, p in zip(areas, perimeters)]
+        except INPUT_ERRORS:
+            pass
+    failed = False
+    for i, line in enumerate(lines):
+        if records is not None:
+            record = records[i]
+        else:
+            try:
+                record = _polygon_record(line)
+            except INPUT_ERRORS as e:
+                record = {"error": str(e)}
+                failed = True
+        writer.write({"input": line, **record})
+    return 1 if failed else 0
+
+def run_sort(args):
+    writer = Writer(args.format, ("value",))
+    try:
+        batch = NumberBatch.from_strings(_iter_values(iter_lines(args)))
+        order = batch.sort_order(reverse=args.desc)
+    except INPUT_ERRORS as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    for value in batch.iter_spellings(order):
+        writer.write({"value": value})
+    return 0
+
+def run_stats(args):
+    writer = Writer(args.format, ("count", "mean", "median", "range"))
+    try:
+        batch = NumberBatch.from_strings(_iter_values(iter_lines(args)))
+        if not len(batch):
+            raise ValueError("No valid numbers to calculate stats.")
+        mean_val, median_val, range_val = batch.stats()
+        record = {"count": len(batch), "mean": fraction_to_decimal_str(mean_val),
+                  "median": fraction_to_decimal_str(median_val),
+                  "range": fraction_to_decimal_str(range_val)}
+    except INPUT_ERRORS as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    writer.write(record)
+    return 0
+
+
+def run_format(args):
+    try:
+        compile_format(args.spec)  # reject a bad spec before reading the input
+        batch = NumberBatch.from_strings(_iter_values(iter_lines(args)))
+        batch.write_formatted(args.spec, sys.stdout.write)
+    except INPUT_ERRORS as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if len(batch):
+        sys.stdout.write("\n")
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="NumberCLI", description="NumberTool operations without the GUI")
+    sub = ap.add_subparsers(dest="command", required=True)
+    for name in ("sort", "stats", "format", "polygon") + tuple(RECORD_OPS):
+        p = sub.add_parser(name)
+        p.add_argument("values", nargs="*", help="inputs (default: -f files or stdin)")
+        p.add_argument("-f", "--file", dest="files", action="append", help="read input lines from FILE ('-' for stdin)")
+        p.add_argument("--format", choices=("json", "csv"), default="json")
+        p.add_argument("--precision", type=int, metavar="N", help="compute decimal results to N significant digits")
+        p.add_argument("--snap-den", type=int, metavar="N",
+                       help="replace inputs by their closest fraction with denominator <= N")
+        p.add_argument("--snap-tol", metavar="X",
+                       help="replace inputs by the simplest fraction within X (e.g. 1e-6)")
+        if name == "sort":
+            p.add_argument("--desc", action="store_true", help="greatest to least")
+        if name == "format":
+            p.add_argument("--spec", default="mixed", help="output format spec (default: mixed)")
+    args = ap.parse_args(argv)
+    if args.precision is not None:
+        if args.precision < 1:
+            ap.error("--precision must be at least 1")
+        set_precision(args.precision)
+    if args.snap_den is not None or args.snap_tol is not None:
+        try:
+            tol = None if args.snap_tol is None else parse_number(args.snap_tol)
+            set_snap(args.snap_den, tol)
+        except ValueError as e:
+            ap.error(str(e))
+
+    try:
+        if args.command == "sort":
+            return run_sort(args)
+        if args.command == "stats":
+            return run_stats(args)
+        if args.command == "format":
+            return run_format(args)
+        if args.command == "polygon":
+            return run_polygon(args)
+        return run_records(args)
+    except OSError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        sys.exit(1)
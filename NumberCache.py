@@ -0,0 +1,163 @@
+"""Optional persistent result cache for the costly NumberCore helpers.
+
+Off until enabled, and then only consulted for inputs that are expensive to
+compute. Enable with the environment variable NUMBERTOOL_CACHE=1 (default
+file numbertool_cache.sqlite in the working directory) or
+NUMBERTOOL_CACHE=<path>, or call enable() directly. The cache holds at most
+NUMBERTOOL_CACHE_MAX entries (default 100000); when full, the least recently
+used tenth is evicted.
+
+Entries are keyed by operation, the normalized input (canonical Fractions,
+so '0.5', '1/2' and '50%' share one entry) and the precision in effect
+(NumberCore.set_precision() and the Decimal context). A lookup costs
+some 20-35 us, so only work slower than that goes through the cache:
+decimal expansions and square roots at high precision settings, and
+fractional powers at a set precision. Everything else bypasses it.
+"""
+import decimal
+import functools
+import os
+import re
+import sqlite3
+from fractions import Fraction
+
+from NumberCore import parse_number, get_precision
+
+MAX_ENTRIES = int(os.environ.get("NUMBERTOOL_CACHE_MAX", "100000"))
+# precision settings from which computing costs more than a lookup
+DECIMAL_MIN_PRECISION = 1000
+SQRT_MIN_PRECISION = 300
+# exponents that are plain integers of up to this many digits are not cached
+_SMALL_EXPONENT = re.compile(r'[+-]?\d{1,4}')
+
+_conn = None
+_clock = 0  # last-use counter for LRU eviction
+_hits = 0
+_misses = 0
+_touched = {}  # key -> last use, written back in batches rather than on every hit
+_TOUCH_BATCH = 256
+
+
+# ---------- control ----------
+def enable(path="numbertool_cache.sqlite"):
+    global _conn, _clock
+    disable()
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS results ("
+                 "key TEXT PRIMARY KEY, value TEXT NOT NULL, used INTEGER NOT NULL)")
+    conn.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+    _clock = conn.execute("SELECT COALESCE(MAX(used), 0) FROM results").fetchone()[0]
+    _conn = conn
+
+def disable():
+    global _conn
+    if _conn is not None:
+        _flush_touched()
+        _conn.close()
+        _conn = None
+
+def is_enabled():
+    return _conn is not None
+
+def clear():
+    _touched.clear()
+    if _conn is not None:
+        _conn.execute("DELETE FROM results")
+
+def stats():
+    """Return {"entries", "hits", "misses"} for this session."""
+    entries = _conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] if _conn is not None else 0
+    return {"entries": entries, "hits": _hits, "misses": _misses}
+
+
+# ---------- keys ----------
+def _canonical(text):
+    """Canonical spelling of a number string, or the stripped text if it is not a number."""
+    text = text.strip()
+    try:
+        return str(parse_number(text))
+    except ValueError:
+        return text
+
+def _fraction_part(frac: Fraction, min_precision):
+    # hex: cheaper than str() for big integers, and not limited in length
+    precision = get_precision()
+    if precision is None or precision < min_precision:
+        return None
+    return f"{frac.numerator:x}/{frac.denominator:x}"
+
+def decimal_key(frac: Fraction):
+    """Key part for fraction_to_decimal_str; None below DECIMAL_MIN_PRECISION digits."""
+    return _fraction_part(frac, DECIMAL_MIN_PRECISION)
+
+def sqrt_key(frac: Fraction):
+    """Key part for sqrt_str; None below SQRT_MIN_PRECISION digits."""
+    return _fraction_part(frac, SQRT_MIN_PRECISION)
+
+def exponent_key(rule_code, base_text, e1_text, e2_text=""):
+    """Key part for exponent_evaluate: rule plus canonical base and exponents.
+
+    None without a precision setting (the result is one float power) and for
+    plain integer exponents (an exact Decimal power); only fractional powers
+    at a set precision are slower than the lookup.
+    """
+    if get_precision() is None:
+        return None
+    exponents = [t.strip() for t in (e1_text, e2_text) if t.strip()]
+    if all(_SMALL_EXPONENT.fullmatch(t) for t in exponents):
+        return None
+    return "|".join((rule_code, _canonical(base_text), _canonical(e1_text), _canonical(e2_text)))
+
+
+# ---------- wrapper ----------
+def cached(op, fn, key):
+    """Wrap `fn` so results are looked up in / stored to the cache.
+
+    `key(*args)` returns the normalized input as a string, or None to call
+    `fn` directly. Results must be strings; exceptions are not cached.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args):
+        global _clock, _hits, _misses
+        if _conn is None:
+            return fn(*args)
+        part = key(*args)
+        if part is None:
+            return fn(*args)
+        k = f"{op}|{get_precision()}/{decimal.getcontext().prec}|{part}"
+        _clock += 1
+        row = _conn.execute("SELECT value FROM results WHERE key = ?", (k,)).fetchone()
+        if row is not None:
+            _hits += 1
+            _touched[k] = _clock
+            if len(_touched) >= _TOUCH_BATCH:
+                _flush_touched()
+            return row[0]
+        _misses += 1
+        value = fn(*args)
+        _conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (k, value, _clock))
+        if _misses % max(1, min(256, MAX_ENTRIES // 10)) == 0:
+            _evict()
+        return value
+    return wrapper
+
+def _flush_touched():
+    _conn.executemany("UPDATE results SET used = ? WHERE key = ?",
+                      [(used, k) for k, used in _touched.items()])
+    _touched.clear()
+
+def _evict():
+    _flush_touched()
+    count = _conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    if count <= MAX_ENTRIES:
+        return
+    drop = count - MAX_ENTRIES + MAX_ENTRIES // 10
+    _conn.execute("DELETE FROM results WHERE key IN "
+                  "(SELECT key FROM results ORDER BY used LIMIT ?)", (drop,))
+
+
+_mode = os.environ.get("NUMBERTOOL_CACHE", "").strip()
+if _mode and _mode != "0":
+    enable("numbertool_cache.sqlite" if _mode == "1" else _mode)
@@ -0,0 +1,1308 @@
+"""Pure number utilities shared by the NumberTool GUI (no tkinter imports)."""
+from fractions import Fraction
+from decimal import Decimal, InvalidOperation
+import ast
+import decimal
+import functools
+import itertools
+import math
+import operator
+import re
+from array import array
+
+# ---------- parsing / math utilities ----------
+def parse_number(num_str):
+    """Convert a number string (decimal, fraction, percent, whole, or mixed like '-3 6/7') to Fraction.
+
+    When a snap mode is set (set_snap) the value is replaced by its best simple
+    rational approximation.
+    """
+    frac = _parse_exact(num_str)
+    if _snap is not None:
+        return Fraction(*best_rational(frac.numerator, frac.denominator, *_snap))
+    return frac
+
+def _parse_exact(num_str):
+    s = num_str.strip()
+    if not s:
+        raise ValueError("Empty number")
+    try:
+        if s.endswith('%'):
+            val = Decimal(s[:-1])
+            return Fraction(val) / 100
+        if ' ' in s and '/' in s:
+            parts = s.split()
+            if len(parts) == 2:
+                whole_str, frac_str = parts
+                sign = -1 if whole_str.startswith('-') else 1
+                whole = int(whole_str.lstrip('+-'))
+                num_str2, den_str = frac_str.split('/', 1)
+                num = int(num_str2)
+                den = int(den_str)
+                if den == 0:
+                    raise ZeroDivisionError("Denominator cannot be zero")
+                return Fraction(sign * (whole * den + num), den)
+        if '/' in s:
+            return Fraction(s)
+        try:
+            d = Decimal(s)
+            return Fraction(d)
+        except InvalidOperation:
+            return Fraction(float(s))
+    except (ValueError, ZeroDivisionError, InvalidOperation) as e:
+        raise ValueError(f"Invalid number: {num_str}") from e
+
+class MissingInput(ValueError):
+    """A required field was left empty (the GUI shows this as a warning)."""
+
+# ---------- snapping to simple rationals ----------
+# None, or (max_den, tol): parsed values are replaced by the simplest fraction
+# within tol of them, limited to denominators <= max_den (either may be None)
+_snap = None
+
+def set_snap(max_den=None, tol=None):
+    """Turn snap mode on (either limit given) or off (both None)."""
+    global _snap
+    if max_den is not None and max_den < 1:
+        raise ValueError("Maximum denominator must be at least 1.")
+    if tol is not None:
+        tol = Fraction(tol)
+        if tol < 0:
+            raise ValueError("Tolerance must not be negative.")
+    _snap = None if max_den is None and tol is None else (max_den, tol)
+
+def get_snap():
+    return _snap
+
+def _simplest_between(ln, ld, hn, hd):
+    """Smallest-denominator fraction in [ln/ld, hn/hd] (0 <= low <= high), as (p, q).
+
+    Walks the continued fractions of both ends together; every intermediate
+    value is bounded by the inputs.
+    """
+    # convergent recurrences: p = a*p1 + p0, q = a*q1 + q0
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    while True:
+        a = ln // ld
+        if a * ld == ln or (a + 1) * hd <= hn:
+            # low is an integer, or an integer lies in (low, high]
+            a = a if a * ld == ln else a + 1
+            return a * p1 + p0, a * q1 + q0
+        p0, q0, p1, q1 = p1, q1, a * p1 + p0, a * q1 + q0
+        # continue with the reciprocals of the fractional parts (order flips)
+        ln, ld, hn, hd = hd, hn - a * hd, ld, ln - a * ld
+
+def _limit_denominator(n, d, max_den):
+    """Closest fraction to n/d with denominator <= max_den (as Fraction.limit_denominator)."""
+    if d <= max_den:
+        return n, d
+    p0, q0, p1, q1 = 0, 1, 1, 0
+    d0 = d
+    while True:
+        a = n // d
+        q2 = q0 + a * q1
+        if q2 > max_den:
+            break
+        p0, q0, p1, q1 = p1, q1, p0 + a * p1, q2
+        n, d = d, n - a * d
+        if not d:  # n/d was not in lowest terms; it equals p1/q1
+            return p1, q1
+    k = (max_den - q0) // q1
+    # the semiconvergent or the last convergent, whichever is closer (the
+    # convergent on a tie, like Fraction): they are 1/(q1*bd) apart and the
+    # convergent is d/(q1*d0) away from the input
+    bn, bd = p0 + k * p1, q0 + k * q1
+    if 2 * d * bd <= d0:
+        return p1, q1
+    return bn, bd
+
+def best_rational(n, d, max_den=None, tol=None):
+    """Best simple rational approximation of reduced n/d (d > 0) as (p, q) in lowest terms.
+
+    With `tol`, the smallest-denominator fraction within tol of n/d; with
+    `max_den`, the closest fraction whose denominator is at most max_den.
+    Given both, the tolerance result is used when its denominator fits.
+    """
+    if tol is not None:
+        sign = -1 if n < 0 else 1
+        # |n|/d -/+ tn/td over the common denominator d*td (no gcd needed)
+        tn, td = tol.numerator, tol.denominator
+        a = abs(n) * td
+        t = tn * d
+        if a <= t:
+            return 0, 1
+        p, q = _simplest_between(a - t, d * td, a + t, d * td)
+        if max_den is None or q <= max_den:
+            return sign * p, q
+    if max_den is not None:
+        return _limit_denominator(n, d, max_den)
+    return n, d
+
+def snap_pairs(numerators, denominators, max_den=None, tol=None):
+    """best_rational() over parallel sequences; returns (numerators, denominators) lists."""
+    nums = []
+    dens = []
+    for n, d in zip(numerators, denominators):
+        p, q = best_rational(n, d, max_den, tol)
+        nums.append(p)
+        dens.append(q)
+    return nums, dens
+
+# ---------- numeric precision ----------
+# None: float results (.12g, .6g in geometry) and the default Decimal context in
+# the converters. An int N: Decimal arithmetic at N significant digits instead.
+_precision = None
+
+def set_precision(digits):
+    global _precision
+    if digits is not None and digits < 1:
+        raise ValueError("Precision must be at least 1 digit.")
+    _precision = digits
+
+def get_precision():
+    return _precision
+
+@functools.lru_cache(maxsize=None)
+def _context_for(prec):
+    return decimal.Context(prec=prec, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+def _decimal_context():
+    """Context of the precision setting, or the current default context."""
+    if _precision is None:
+        return decimal.getcontext()
+    return _context_for(_precision)
+
+@functools.lru_cache(maxsize=16)
+def pi_decimal(prec):
+    """pi to `prec` significant digits, computed once per precision."""
+    ctx = _context_for(prec + 3)  # guard digits
+    # series from the decimal module documentation
+    lasts, t, s, n, na, d, da = 0, Decimal(3), Decimal(3), 1, 0, 0, 24
+    while s != lasts:
+        lasts = s
+        n, na = n + na, na + 8
+        d, da = d + da, da + 32
+        t = ctx.divide(ctx.multiply(t, n), d)
+        s = ctx.add(s, t)
+    return _context_for(prec).plus(s)
+
+def to_decimal(value):
+    """Fraction, int, float or Decimal as a Decimal at the precision setting."""
+    ctx = _decimal_context()
+    if isinstance(value, Fraction):
+        return ctx.divide(Decimal(value.numerator), Decimal(value.denominator))
+    return ctx.plus(Decimal(value))
+
+def decimal_text(d: Decimal):
+    """Decimal as text without trailing zeros; scientific notation for very large/small values."""
+    if not d.is_finite():
+        return str(d)
+    d = d.normalize(_decimal_context())
+    if d.is_zero():
+        return "0"
+    if -7 < d.adjusted() < (_precision or 28):
+        return format(d, 'f')
+    return str(d)
+
+def approx_str(value, digits=12):
+    """Approximate decimal text: float .{digits}g, or the precision setting's digits."""
+    if _precision is None:
+        return f"{float(value):.{digits}g}"
+    return decimal_text(to_decimal(value))
+
+# ---------- exact summation ----------
+_LCM_GROUPS = 32  # above this many distinct denominators use pairwise tree addition
+
+def exact_sum(values):
+    """Exactly sum Fractions/ints without a gcd per term.
+
+    Numerators are accumulated as plain integers grouped by denominator
+    (decimal inputs share a handful of 2^a*5^b denominators), the groups are
+    scaled to one common denominator and the result is reduced once.
+    """
+    groups = {}
+    get = groups.get
+    for v in values:
+        d = v.denominator
+        groups[d] = get(d, 0) + v.numerator
+    return _combine_groups(groups)
+
+def exact_sum_pairs(numerators, denominators):
+    """exact_sum() over parallel numerator/denominator sequences."""
+    groups = {}
+    get = groups.get
+    for n, d in zip(numerators, denominators):
+        groups[d] = get(d, 0) + n
+    return _combine_groups(groups)
+
+def _combine_groups(groups):
+    if not groups:
+        return Fraction(0)
+    if len(groups) <= _LCM_GROUPS:
+        common = math.lcm(*groups)
+        total = 0
+        for d, num in groups.items():
+            total += num * (common // d)
+        return Fraction(total, common)
+    # many unrelated denominators: the lcm route turns quadratic, so add the
+    # groups pairwise in a balanced tree and still reduce only once
+    items = [(num, d) for d, num in groups.items()]
+    while len(items) > 1:
+        paired = [(a * d + c * b, b * d) for (a, b), (c, d) in zip(items[::2], items[1::2])]
+        if len(items) % 2:
+            paired.append(items[-1])
+        items = paired
+    return Fraction(*items[0])
+
+
+#calc
+_calc_binops = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_calc_unaryops = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_CALC_MAX_EXPONENT = 10000
+_CALC_MAX_BITS = 1 << 20  # integer results (powers, products) larger than this are refused
+
+def evaluate_expression(expr):
+    """Evaluate a calculator expression (numbers, + - * / // % **, parentheses).
+
+    Same results as eval() on plain arithmetic, but nothing else is allowed,
+    so it is safe for input that did not come from the calculator keypad.
+    Integer results are capped at _CALC_MAX_BITS and nesting at the recursion
+    limit, so a short expression cannot keep the caller busy for minutes.
+    """
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+        return _calc_eval(tree.body)
+    except (SyntaxError, RecursionError) as e:
+        raise ValueError("Invalid Expression") from e
+
+def _calc_eval(node):
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _calc_binops:
+        left = _calc_eval(node.left)
+        right = _calc_eval(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > _CALC_MAX_EXPONENT:
+            raise ValueError("Exponent too large")
+        if type(left) is int and type(right) is int:
+            if isinstance(node.op, ast.Pow):
+                bits = abs(left).bit_length() * right
+            elif isinstance(node.op, ast.Mult):
+                bits = abs(left).bit_length() + abs(right).bit_length()
+            else:
+                bits = 0
+            if bits > _CALC_MAX_BITS:
+                raise ValueError("Result too large")
+        return _calc_binops[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _calc_unaryops:
+        return _calc_unaryops[type(node.op)](_calc_eval(node.operand))
+    raise ValueError("Invalid Expression")
+
+
+#mmr 
+def calculate_stats(numbers):
+    """numbers: list of strings; returns (mean, median, range) as Fractions"""
+    batch = NumberBatch.from_strings(numbers)
+    if not len(batch):
+        raise ValueError("No valid numbers to calculate stats.")
+    return batch.stats()
+
+
+
+def sort_numbers(numbers, reverse=False):
+    """Sort list of number strings in ascending or descending order.
+    Preserve the original (unsimplified) string representation in the output.
+    """
+    return NumberBatch.from_strings(numbers).sorted_spellings(reverse)
+
+def fraction_to_decimal_str(frac: Fraction):
+    return compile_format("decimal")(frac.numerator, frac.denominator)
+
+def fraction_to_percent_str(frac: Fraction):
+    return compile_format("percent")(frac.numerator, frac.denominator)
+
+# ---------- compact number batches ----------
+_MAX_SCALE = 18  # 10**18 still fits in int64
+
+def _scale_for(den):
+    """Smallest k with den dividing 10**k, or None if den has other prime factors."""
+    k = 0
+    p = 1
+    while k <= _MAX_SCALE:
+        if p % den == 0:
+            return k
+        k += 1
+        p *= 10
+    return None
+
+class NumberBatch:
+    """Compact container for a batch of parsed numbers.
+
+    Values live in parallel numerator/denominator int64 arrays (falling back
+    to plain lists once a value does not fit), and the original spellings are
+    start/end offsets into one text buffer instead of a string per value.
+    When every denominator divides 10**k the values are also exposed as a
+    single scaled int64 array, which sort and stats use directly.
+    """
+
+    def __init__(self, text=""):
+        self.text = text
+        self.starts = array('q')
+        self.ends = array('q')
+        self.numerators = array('q')
+        self.denominators = array('q')
+        self._scaled = None
+
+    @classmethod
+    def from_text(cls, text, sep=','):
+        """Parse `sep`-separated numbers from `text`, skipping blank entries."""
+        batch = cls(text)
+        pos = 0
+        size = len(text)
+        while pos <= size:
+            end = text.find(sep, pos)
+            if end == -1:
+                end = size
+            token = text[pos:end]
+            stripped = token.strip()
+            if stripped:
+                start = pos + len(token) - len(token.lstrip())
+                batch._append(_parse_exact(stripped), start, start + len(stripped))
+            pos = end + len(sep)
+        return batch.snapped(*_snap) if _snap is not None else batch
+
+    @classmethod
+    def from_strings(cls, strings):
+        """Parse an iterable of number strings, skipping blank entries."""
+        batch = cls()
+        parts = []
+        pos = 0
+        for s in strings:
+            stripped = s.strip()
+            if stripped:
+                batch._append(_parse_exact(stripped), pos, pos + len(stripped))
+                parts.append(stripped)
+                pos += len(stripped)
+        batch.text = "".join(parts)
+        return batch.snapped(*_snap) if _snap is not None else batch
+
+    def snapped(self, max_den=None, tol=None):
+        """New batch (same spellings) with every value replaced by best_rational()."""
+        out = NumberBatch(self.text)
+        out.starts = self.starts
+        out.ends = self.ends
+        nums, dens = snap_pairs(self.numerators, self.denominators, max_den, tol)
+        try:
+            out.numerators = array('q', nums)
+        except OverflowError:
+            out.numerators = nums
+        try:
+            out.denominators = array('q', dens)
+        except OverflowError:
+            out.denominators = dens
+        return out
+
+    def _append(self, frac, start, end):
+        self.starts.append(start)
+        self.ends.append(end)
+        try:
+            self.numerators.append(frac.numerator)
+        except OverflowError:
+            self.numerators = list(self.numerators)
+            self.numerators.append(frac.numerator)
+        try:
+            self.denominators.append(frac.denominator)
+        except OverflowError:
+            self.denominators = list(self.denominators)
+            self.denominators.append(frac.denominator)
+        self._scaled = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def value(self, i):
+        return Fraction(self.numerators[i], self.denominators[i])
+
+    def values(self):
+        return map(Fraction, self.numerators, self.denominators)
+
+    def spelling(self, i):
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def scaled(self):
+        """Return (int64 array, k) with value i == array[i] / 10**k, or None."""
+        if self._scaled is None:
+            self._scaled = self._build_scaled() or False
+        return self._scaled or None
+
+    def _build_scaled(self):
+        scale = 0
+        for den in set(self.denominators):
+            k = _scale_for(den)
+            if k is None:
+                return None
+            scale = max(scale, k)
+        factor = 10 ** scale
+        try:
+            arr = array('q', (n * (factor // d) for n, d in zip(self.numerators, self.denominators)))
+        except OverflowError:
+            return None
+        return arr, scale
+
+    def sort_order(self, reverse=False):
+        """Indices in sorted value order (stable, like list.sort) as an int64 array."""
+        sc = self.scaled()
+        key = sc[0].__getitem__ if sc else self.value
+        return array('q', sorted(range(len(self)), key=key, reverse=reverse))
+
+    def sorted_spellings(self, reverse=False):
+        return [self.spelling(i) for i in self.sort_order(reverse)]
+
+    def iter_spellings(self, order, start=0, stop=None):
+        """Yield the spellings of order[start:stop] without copying the rest."""
+        text, starts, ends = self.text, self.starts, self.ends
+        stop = len(order) if stop is None else min(stop, len(order))
+        for pos in range(start, stop):
+            i = order[pos]
+            yield text[starts[i]:ends[i]]
+
+    def write_spellings(self, order, write, sep=", ", chunk=1024):
+        """Stream the spellings in `order` to write(str), `chunk` values per call."""
+        for pos in range(0, len(order), chunk):
+            part = sep.join(self.iter_spellings(order, pos, pos + chunk))
+            write(part if pos == 0 else sep + part)
+
+    def stats(self):
+        """Return (mean, median, range) as Fractions."""
+        n = len(self)
+        sc = self.scaled()
+        if sc:
+            arr, scale = sc
+            factor = 10 ** scale
+            ordered = sorted(arr)
+            mean_val = Fraction(sum(arr), n * factor)
+            mid = n // 2
+            if n % 2 == 1:
+                median_val = Fraction(ordered[mid], factor)
+            else:
+                median_val = Fraction(ordered[mid - 1] + ordered[mid], 2 * factor)
+            range_val = Fraction(ordered[-1] - ordered[0], factor)
+            return mean_val, median_val, range_val
+
+        nums_sorted = sorted(self.values())
+        mean_val = exact_sum_pairs(self.numerators, self.denominators) / n
+        mid = n // 2
+        if n % 2 == 1:
+            median_val = nums_sorted[mid]
+        else:
+            median_val = (nums_sorted[mid - 1] + nums_sorted[mid]) / 2
+        range_val = nums_sorted[-1] - nums_sorted[0]
+        return mean_val, median_val, range_val
+
+    def write_formatted(self, spec, write, order=None, sep="\n", chunk=1024):
+        """Stream every value (or those in `order`) formatted with `spec` to write(str)."""
+        nums, dens = self.numerators, self.denominators
+        if order is not None:
+            nums = map(nums.__getitem__, order)
+            dens = map(dens.__getitem__, order)
+        write_formatted(spec, nums, dens, write, sep, chunk)
+
+# ---------- output formats ----------
+# A format spec is "name" or "name:arg":
+#   fraction          -3/7, 5
+#   mixed             -3 6/7
+#   decimal[:places]  significant digits of the precision setting, or fixed places
+#   percent[:places]  like decimal, times 100 with a '%' suffix
+#   sci[:digits]      1.23457e+05 (default 6 significant digits)
+#   nearest:den       rounded to the nearest 1/den, shown as a mixed number
+# compile_format() turns a spec into a formatter taking (numerator, denominator)
+# that works on plain integers only; specs are compiled once per precision.
+
+def _round_div(n, d):
+    """n/d rounded half to even (d > 0)."""
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q & 1):
+        q += 1
+    return q
+
+def _significant(a, d, prec):
+    """(digits, exp) with a/d ~= digits * 10**exp, digits having `prec` digits (a > 0)."""
+    # the bit-length estimate of log10(a/d) is off by at most one, so guard
+    # digits leave more than `prec` digits after one long division
+    shift = prec + 2 - math.floor((a.bit_length() - d.bit_length()) * 0.30102999566398120)
+    while True:
+        if shift >= 0:
+            q, r = divmod(a * 10 ** shift, d)
+        else:
+            q, r = divmod(a, d * 10 ** -shift)
+        extra = len(str(q)) - prec
+        if extra > 0:
+            break
+        shift += 1 - extra
+    unit = 10 ** extra
+    digits, rest = divmod(q, unit)
+    half = unit // 2
+    if rest > half or (rest == half and (r or digits & 1)):
+        digits += 1
+        if digits == 10 ** prec:
+            return digits // 10, extra - shift + 1
+    return digits, extra - shift
+
+def _place_point(digits_text, exp):
+    """Plain notation of int(digits_text) * 10**exp."""
+    if exp >= 0:
+        return digits_text + "0" * exp
+    k = -exp
+    if len(digits_text) > k:
+        return digits_text[:-k] + "." + digits_text[-k:]
+    return "0." + "0" * (k - len(digits_text)) + digits_text
+
+def _fmt_fraction(n, d):
+    return str(n) if d == 1 else f"{n}/{d}"
+
+def _fmt_mixed(n, d):
+    if d == 1:
+        return str(n)
+    whole, rem = divmod(abs(n), d)
+    sign = "-" if n < 0 else ""
+    if not whole:
+        return f"{sign}{rem}/{d}"
+    return f"{sign}{whole} {rem}/{d}"
+
+def _decimal_formatter(prec, scale=1, suffix=""):
+    terminating = {}  # denominator -> (10**k // d, k), or None; columns share few denominators
+    def fmt(n, d):
+        n *= scale
+        if not n:
+            return "0" + suffix
+        term = terminating.get(d, False)
+        if term is False:
+            k = _scale_for(d)
+            term = terminating[d] = None if k is None else (10 ** k // d, k)
+        if term is not None:
+            # exact digits when they fit the precision: no rounding needed
+            mult, k = term
+            text = str(abs(n) * mult)
+            if len(text.lstrip("0")) <= prec:
+                if k:
+                    text = text.rjust(k + 1, "0")
+                    frac = text[-k:].rstrip("0")
+                    text = text[:-k] + "." + frac if frac else text[:-k]
+                return ("-" + text if n < 0 else text) + suffix
+        digits, exp = _significant(abs(n), d, prec)
+        text = str(digits)
+        stripped = text.rstrip("0")
+        out = _place_point(stripped, exp + len(text) - len(stripped))
+        return ("-" + out if n < 0 else out) + suffix
+    return fmt
+
+def _fixed_formatter(places, scale=1, suffix=""):
+    unit = 10 ** places
+    def fmt(n, d):
+        q = _round_div(n * scale * unit, d)
+        text = _place_point(str(abs(q)).rjust(places + 1, "0"), -places) if places else str(abs(q))
+        return ("-" + text if q < 0 else text) + suffix
+    return fmt
+
+def _sci_formatter(digits):
+    zero = ("0." + "0" * (digits - 1) if digits > 1 else "0") + "e+00"
+    def fmt(n, d):
+        if not n:
+            return zero
+        mant, exp = _significant(abs(n), d, digits)
+        text = str(mant)
+        head = text[0] + "." + text[1:] if digits > 1 else text
+        return f"{'-' if n < 0 else ''}{head}e{exp + digits - 1:+03d}"
+    return fmt
+
+def _nearest_formatter(den):
+    def fmt(n, d):
+        q = _round_div(n * den, d)
+        g = math.gcd(q, den)
+        return _fmt_mixed(q // g, den // g)
+    return fmt
+
+@functools.lru_cache(maxsize=64)
+def _compile(spec, prec):
+    name, _, arg = spec.strip().partition(":")
+    name = name.strip().lower()
+    try:
+        n = int(arg) if arg.strip() else None
+    except ValueError:
+        raise ValueError(f"Invalid format spec: {spec}") from None
+    if n is not None and n < (1 if name in ("sci", "nearest") else 0):
+        raise ValueError(f"Invalid format spec: {spec}")
+    if name == "fraction" and n is None:
+        return _fmt_fraction
+    if name == "mixed" and n is None:
+        return _fmt_mixed
+    if name in ("decimal", "percent"):
+        scale, suffix = (100, "%") if name == "percent" else (1, "")
+        if n is None:
+            return _decimal_formatter(prec, scale, suffix)
+        return _fixed_formatter(n, scale, suffix)
+    if name == "sci":
+        return _sci_formatter(n or 6)
+    if name == "nearest" and n is not None:
+        return _nearest_formatter(n)
+    raise ValueError(f"Invalid format spec: {spec}")
+
+def compile_format(spec):
+    """Formatter fmt(numerator, denominator) -> str for `spec` (cached per precision)."""
+    return _compile(spec, _decimal_context().prec)
+
+def format_value(spec, frac: Fraction):
+    return compile_format(spec)(frac.numerator, frac.denominator)
+
+def write_formatted(spec, numerators, denominators, write, sep="\n", chunk=1024):
+    """Format parallel numerator/denominator sequences and stream them to write(str).
+
+    Values are joined `chunk` at a time, so a column of any length is written
+    without building one string per value list.
+    """
+    fmt = compile_format(spec)
+    pairs = map(fmt, numerators, denominators)
+    first = True
+    while True:
+        part = sep.join(itertools.islice(pairs, chunk))
+        if not part:
+            break
+        write(part if first else sep + part)
+        first = False
+
+# square root
+def sqrt_str(frac: Fraction):
+    """Square root of a non-negative Fraction as text (whole roots shown exactly)."""
+    if _precision is not None:
+        if frac < 0:
+            raise ValueError("Cannot take square root of a negative number.")
+        return decimal_text(_decimal_context().sqrt(to_decimal(frac)))
+    val = float(frac.numerator) / float(frac.denominator)
+    if val < 0:
+        raise ValueError("Cannot take square root of a negative number.")
+    root = math.sqrt(val)
+    if abs(root - round(root)) < 1e-12:
+        return str(int(round(root)))
+    return f"{root:.12g}"
+
+# Exponent rule (symbolic only)
+# friendly short labels -> internal codes
+rules_map = {
+    "Product Rule": "multiply_same_base",
+    "Quotient Rule": "divide_same_base",
+    "Power Rule": "power_of_power",
+    "Negative Exponent Rule": "negative_exponent",   # <--- added
+}
+
+def format_exp(frac: Fraction):
+    if frac.denominator == 1:
+        return str(frac.numerator)
+    return f"{frac.numerator}/{frac.denominator}"
+
+def try_parse_exponent(es):
+    es = es.strip()
+    if es == "":
+        raise ValueError("Exponent is empty")
+    return parse_number(es)
+
+def _negative_exponent(e1_text, e2_text):
+    """Exponent for the negative exponent rule (exponent 1 if present, otherwise exponent 2)."""
+    es = e1_text.strip() or e2_text.strip()
+    if not es:
+        raise MissingInput("Enter an exponent (negative integer).")
+    e = try_parse_exponent(es)
+    # require a negative integer (denominator == 1 and numerator < 0)
+    if e.denominator != 1 or e.numerator >= 0:
+        raise MissingInput("Exponent must be a negative integer for this rule.")
+    return e
+
+def exponent_rule(rule_code, base_text, e1_text, e2_text=""):
+    """Symbolic result of an exponent rule, e.g. '(x^2)^3 = x^6'."""
+    base_text = base_text.strip()
+    if not base_text:
+        raise MissingInput("Enter a base (number or symbol).")
+    if rule_code == "negative_exponent":
+        e = _negative_exponent(e1_text, e2_text)
+        pos = Fraction(-e.numerator, 1)
+        return f"{base_text}^{format_exp(e)} = 1/{base_text}^{format_exp(pos)}"
+
+    e1 = try_parse_exponent(e1_text)
+    e2 = try_parse_exponent(e2_text)
+    if rule_code == "power_of_power":
+        result_exp = e1 * e2
+        return f"({base_text}^{format_exp(e1)})^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
+    elif rule_code == "multiply_same_base":
+        result_exp = e1 + e2
+        return f"{base_text}^{format_exp(e1)} * {base_text}^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
+    elif rule_code == "divide_same_base":
+        result_exp = e1 - e2
+        return f"{base_text}^{format_exp(e1)} / {base_text}^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
+    return "Unknown rule"
+
+def exponent_evaluate(rule_code, base_text, e1_text, e2_text=""):
+    """Numeric value of an exponent rule's result as text.
+
+    Returns "(symbolic only)" when the base is not a number; arithmetic
+    failures (e.g. ZeroDivisionError) propagate to the caller.
+    """
+    base_text = base_text.strip()
+    if not base_text:
+        raise MissingInput("Enter a base (number or symbol).")
+    if rule_code == "negative_exponent":
+        res_exp = _negative_exponent(e1_text, e2_text)
+    else:
+        e1 = try_parse_exponent(e1_text)
+        e2 = try_parse_exponent(e2_text)
+        if rule_code == "power_of_power":
+            res_exp = e1 * e2
+        elif rule_code == "multiply_same_base":
+            res_exp = e1 + e2
+        elif rule_code == "divide_same_base":
+            res_exp = e1 - e2
+        else:
+            raise ValueError("Unknown rule.")
+
+    try:
+        base_frac = parse_number(base_text)
+    except ValueError:
+        return "(symbolic only)"
+    if _precision is not None:
+        return decimal_text(_decimal_power(base_frac, res_exp))
+    base_num = float(base_frac.numerator) / float(base_frac.denominator)
+    # numeric evaluation (use float for fractional exponents)
+    numeric = base_num ** float(res_exp)
+    return f"{numeric:.12g}"
+
+def _decimal_power(base: Fraction, exp: Fraction):
+    if not base and exp < 0:  # as the float path: not Decimal's Infinity
+        raise ZeroDivisionError("0 cannot be raised to a negative power")
+    ctx = _decimal_context()
+    if exp.denominator == 1:
+        return ctx.power(to_decimal(base), exp.numerator)
+    b = to_decimal(abs(base))
+    e = _context_for(ctx.prec + 10).divide(Decimal(exp.numerator), Decimal(exp.denominator))
+    if base >= 0:
+        return ctx.power(b, e)
+    if exp.denominator % 2 == 0:
+        raise ValueError("Even root of a negative base has no real value.")
+    # odd root of a negative base: real, with the sign of (-1)**numerator
+    mag = ctx.power(b, e)
+    return -mag if exp.numerator % 2 else mag
+
+# ---------- Algebraic (linear) solver ----------
+def _parse_side_for_var(side: str, var: str):
+    """Return (coeff_sum: Fraction, const_sum: Fraction) for expression side."""
+    side = side.replace('−', '-').replace(' ', '')  # normalize
+    if side == '':
+        return Fraction(0), Fraction(0)
+    tokens = re.findall(r'[+-]?[^+-]+', side)
+    coeff_sum = Fraction(0)
+    const_sum = Fraction(0)
+    for t in tokens:
+        if var in t:
+            # coefficient token e.g. '3x', '-x', '3/2x'
+            coeff_str = t.replace(var, '')
+            if coeff_str in ('', '+'):
+                coeff = Fraction(1)
+            elif coeff_str == '-':
+                coeff = Fraction(-1)
+            else:
+                coeff = parse_number(coeff_str)
+            coeff_sum += coeff
+        else:
+            # constant term
+            const_sum += parse_number(t)
+    return coeff_sum, const_sum
+
+def solve_linear_equation(equation: str):
+    """
+    Solve linear equation in one variable.
+    Supports formats like:
+      2x+3=7
+      -3 1/2x + 4 = x/2 + 1
+      3/4x - 2 = -1/2 x + 5/3
+    Returns tuple (status, message, solution_fraction or None)
+    status: 'unique', 'infinite', 'none', 'error'
+    """
+    try:
+        eq = equation.strip().replace(' ', '')
+        if '=' not in eq:
+            return 'error', "Equation must contain '='.", None
+        left, right = eq.split('=', 1)
+        # detect variable (first alpha char)
+        m = re.search(r'[A-Za-z]', equation)
+        if not m:
+            return 'error', "No variable found in equation.", None
+        var = m.group(0)
+        a_left, b_left = _parse_side_for_var(left, var)
+        a_right, b_right = _parse_side_for_var(right, var)
+        # bring to form (a_left - a_right) * var = (b_right - b_left)
+        a = a_left - a_right
+        b = b_right - b_left
+        if a == 0:
+            if b == 0:
+                return 'infinite', "Infinite solutions (identity).", None
+            else:
+                return 'none', "No solution.", None
+        solution = Fraction(b, a)  # exact rational
+        return 'unique', f"{var} = {solution}", solution
+    except Exception as ex:
+        return 'error', f"Parse error: {ex}", None
+
+# ---------- Geometry ----------
+# Exact measures are (rational, pi_coefficient) pairs meaning rational + pi_coefficient*pi,
+# so "12π" is (0, 12). Irrational results that are not multiples of pi are floats.
+
+# length units as exact multiples of a metre
+UNITS = {
+    "mm": Fraction(1, 1000), "cm": Fraction(1, 100), "m": Fraction(1), "km": Fraction(1000),
+    "in": Fraction(127, 5000), "ft": Fraction(381, 1250), "yd": Fraction(1143, 1250),
+    "mi": Fraction(201168, 125),
+}
+_DIM_SUFFIX = {1: "", 2: "²", 3: "³"}
+
+def unit_factor(from_unit, to_unit, dim=1):
+    """Exact factor converting a measure of dimension `dim` (1 length, 2 area, 3 volume)."""
+    if not from_unit or not to_unit or from_unit == to_unit:
+        return Fraction(1)
+    try:
+        return (UNITS[from_unit] / UNITS[to_unit]) ** dim
+    except KeyError as e:
+        raise ValueError(f"Unknown unit: {e.args[0]}") from None
+
+def _scale(value, k):
+    if isinstance(value, tuple):
+        return (value[0] * k, value[1] * k)
+    if isinstance(value, Decimal):
+        return _decimal_context().multiply(value, to_decimal(k))
+    return value * float(k)
+
+def convert_measures(values, from_unit, to_unit, dim=1):
+    """Convert a list of measures between units with one shared factor."""
+    k = unit_factor(from_unit, to_unit, dim)
+    if k == 1:
+        return list(values)
+    return [_scale(v, k) for v in values]
+
+def sum_measures(values):
+    """Exact sum of (rational, pi_coefficient) pairs."""
+    values = list(values)
+    return (exact_sum(v[0] for v in values), exact_sum(v[1] for v in values))
+
+def measure_float(value):
+    if isinstance(value, tuple):
+        return float(value[0]) + float(value[1]) * math.pi
+    return float(value)
+
+def measure_str(value):
+    """Decimal text of a measure: .6g float, or the precision setting's digits."""
+    if _precision is None:
+        return f"{measure_float(value):.6g}"
+    if isinstance(value, tuple):
+        return decimal_text(_decimal_context().plus(_pair_decimal(value, _context_for(_precision + 3))))
+    return decimal_text(to_decimal(value))
+
+def _pair_decimal(value, ctx):
+    """(rational, pi_coefficient) pair as a Decimal in `ctx` (give it guard digits; round once after)."""
+    rational, pi_coeff = value
+    result = ctx.divide(Decimal(rational.numerator), Decimal(rational.denominator))
+    if pi_coeff:
+        coeff = ctx.divide(Decimal(pi_coeff.numerator), Decimal(pi_coeff.denominator))
+        result = ctx.add(result, ctx.multiply(coeff, pi_decimal(ctx.prec)))
+    return result
+
+def _pi_term(coeff: Fraction):
+    n, d = abs(coeff.numerator), coeff.denominator
+    term = "π" if n == 1 else f"{n}π"
+    if d != 1:
+        term += f"/{d}"
+    return term
+
+def format_pi(value):
+    """Format a (rational, pi_coefficient) pair, e.g. '12π', '3π/4', '5 + 2π'."""
+    rat, pi = value
+    if not pi:
+        return str(rat)
+    term = _pi_term(pi)
+    if not rat:
+        return term if pi > 0 else "-" + term
+    return f"{rat} {'+' if pi > 0 else '-'} {term}"
+
+def _root(radicand):
+    """Square root as an exact pair when radicand is a perfect square Fraction.
+
+    Otherwise a float, or a Decimal when a precision is set.
+    """
+    if isinstance(radicand, float):
+        return math.sqrt(radicand)
+    n, d = radicand.numerator, radicand.denominator
+    rn, rd = math.isqrt(n), math.isqrt(d)
+    if rn * rn == n and rd * rd == d:
+        return (Fraction(rn, rd), Fraction(0))
+    if _precision is not None:
+        return _decimal_context().sqrt(to_decimal(radicand))
+    # scale to ~60 significant bits in integers; n / d as a float over/underflows for huge or tiny values
+    k = max(0, 60 - (n.bit_length() - d.bit_length()) // 2)
+    return math.isqrt((n << 2 * k) // d) / (1 << k)
+
+def _hypot(a, b):
+    """sqrt(a*a + b*b): math.hypot for floats (no overflow on the squares), else _root."""
+    if isinstance(a, float):
+        return math.hypot(a, b)
+    return _root(a * a + b * b)
+
+def _decimal_tan(x: Decimal):
+    """tan(x) at the precision setting (sin/cos series from the decimal documentation)."""
+    with decimal.localcontext(_context_for(_precision + 3)):
+        i, lasts, s, fact, num, sign = 1, 0, x, 1, x, 1
+        while s != lasts:
+            lasts = s
+            i += 2
+            fact *= i * (i - 1)
+            num *= x * x
+            sign *= -1
+            s += num / fact * sign
+        sin = s
+        i, lasts, s, fact, num, sign = 0, 0, 1, 1, 1, 1
+        while s != lasts:
+            lasts = s
+            i += 2
+            fact *= i * (i - 1)
+            num *= x * x
+            sign *= -1
+            s += num / fact * sign
+        return sin / s
+
+# polygons are stored flat: interleaved x, y coordinates of all vertices plus the
+# index of each polygon's first vertex, so one call handles many polygons
+def parse_polygons(polygon_texts):
+    """Parse 'x,y; x,y; ...' strings into (coords, starts, scale).
+
+    Coordinates are exact integers scaled by 10**scale when every one is a
+    decimal, otherwise Fractions with scale 0.
+    """
+    tokens = []
+    starts = []
+    count = 0
+    for text in polygon_texts:
+        starts.append(count)
+        for vertex in text.split(';'):
+            if not vertex.strip():
+                continue
+            parts = vertex.split(',')
+            if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+                raise ValueError(f"Invalid vertex: {vertex.strip()}")
+            tokens.extend(parts)
+            count += 1
+    plain = _plain_scaled(tokens)
+    if plain is not None:
+        return plain[0], starts, plain[1]
+    batch = NumberBatch.from_strings(tokens)
+    sc = batch.scaled()
+    if sc:
+        return sc[0], starts, sc[1]
+    return list(batch.values()), starts, 0
+
+_PLAIN_DECIMAL = re.compile(r'\s*([+-]?\d+)(?:\.(\d*))?\s*')
+
+def _plain_scaled(tokens):
+    """Fast path for plain decimals: (int64 array, k) with value == int / 10**k, or None."""
+    ints = []
+    places = []
+    scale = 0
+    match = _PLAIN_DECIMAL.fullmatch
+    for t in tokens:
+        m = match(t)
+        if m is None:
+            return None
+        whole, frac = m.groups()
+        if frac:
+            k = len(frac)
+            ints.append(int(whole + frac))
+            places.append(k)
+            if k > scale:
+                scale = k
+        else:
+            ints.append(int(whole))
+            places.append(0)
+    if scale > _MAX_SCALE:
+        return None
+    try:
+        if scale == 0:
+            return array('q', ints), 0
+        pow10 = [10 ** (scale - k) for k in range(scale + 1)]
+        return array('q', map(operator.mul, ints, map(pow10.__getitem__, places))), scale
+    except OverflowError:
+        return None
+
+def polygon_measures(coords, starts, scale=0):
+    """Shoelace areas and perimeters of many simple polygons.
+
+    Polygon i uses vertices starts[i] up to starts[i+1] (or the last vertex)
+    of the interleaved `coords`, with values coords / 10**scale. Areas are
+    exact Fractions for int/Fraction coordinates; perimeters are floats.
+    """
+    xs = coords[0::2]
+    ys = coords[1::2]
+    ends = list(starts[1:]) + [len(xs)]
+    unit = 10 ** scale
+    mul, sub, hypot = operator.mul, operator.sub, math.hypot
+    areas = []
+    perimeters = []
+    for a, b in zip(starts, ends):
+        if b - a < 3:
+            raise ValueError("A polygon needs at least 3 vertices.")
+        x = xs[a:b]; y = ys[a:b]
+        x2 = x[1:] + x[:1]; y2 = y[1:] + y[:1]
+        twice = sum(map(mul, x, y2)) - sum(map(mul, x2, y))
+        if isinstance(twice, float):
+            areas.append(abs(twice) / 2 / unit / unit)
+        else:
+            areas.append(Fraction(abs(twice), 2 * unit * unit))
+        perimeters.append(sum(map(hypot, map(sub, x2, x), map(sub, y2, y))) / unit)
+    return areas, perimeters
+
+def _polygon_perimeter_exact(coords):
+    """Perimeter of one polygon as an exact pair when every edge length is rational.
+
+    Otherwise a Decimal at the precision setting, or None when no precision is set.
+    """
+    xs = coords[0::2]; ys = coords[1::2]
+    total = Fraction(0)
+    irrational = []
+    for x1, y1, x2, y2 in zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1]):
+        sq = Fraction((x2 - x1) ** 2 + (y2 - y1) ** 2)
+        rn, rd = math.isqrt(sq.numerator), math.isqrt(sq.denominator)
+        if rn * rn == sq.numerator and rd * rd == sq.denominator:
+            total += Fraction(rn, rd)
+        elif _precision is None:
+            return None
+        else:
+            irrational.append(sq)
+    if not irrational:
+        return (total, Fraction(0))
+    # edges at guard precision, rounded once at the end
+    ctx = _context_for(_precision + 3)
+    peri = ctx.divide(Decimal(total.numerator), Decimal(total.denominator))
+    for sq in irrational:
+        peri = ctx.add(peri, ctx.sqrt(ctx.divide(Decimal(sq.numerator), Decimal(sq.denominator))))
+    return _decimal_context().plus(peri)
+
+def geometry_measures(sel, p1="", p2="", p3="", exact=True):
+    """Measures of shape `sel` as [(label, dim, value, approximate)], or None for an unknown shape.
+
+    `value` is a pair, a float, or a note string such as "(need side length)".
+    With exact=False the pairs hold floats (faster when only decimals are shown).
+    """
+    p1 = p1.strip()
+    p2 = p2.strip()
+    p3 = p3.strip()
+    if exact:
+        num = parse_number
+        zero = Fraction(0)
+    else:
+        def num(s):
+            return float(parse_number(s))
+        zero = 0.0
+
+    if sel == "Circle":
+        if not p1:
+            raise MissingInput("Enter radius.")
+        r = num(p1)
+        return [("Area", 2, (zero, r * r), False), ("Circumference", 1, (zero, 2 * r), False)]
+    elif sel == "Square":
+        if not p1:
+            raise MissingInput("Enter side length.")
+        s = num(p1)
+        return [("Area", 2, (s * s, zero), False), ("Perimeter", 1, (4 * s, zero), False)]
+    elif sel == "Rectangle":
+        if not p1 or not p2:
+            raise MissingInput("Enter width and height.")
+        w = num(p1); h = num(p2)
+        return [("Area", 2, (w * h, zero), False), ("Perimeter", 1, (2 * (w + h), zero), False)]
+    elif sel == "Parallelogram":
+        if not p1 or not p3:
+            raise MissingInput("Enter base and height (side optional for perimeter).")
+        base = num(p1); height = num(p3)
+        if p2:
+            peri = (2 * (base + num(p2)), zero)
+        else:
+            peri = "(need side length)"
+        return [("Area", 2, (base * height, zero), False), ("Perimeter", 1, peri, False)]
+    elif sel == "Trapezoid":
+        if not p1 or not p2 or not p3:
+            raise MissingInput("Enter both bases and height.")
+        a = num(p1); b = num(p2); h = num(p3)
+        return [("Area", 2, ((a + b) * h / 2, zero), False), ("Perimeter", 1, "(need leg lengths)", False)]
+    elif sel == "Triangle Area":
+        if not p1 or not p2:
+            raise MissingInput("Enter base and height.")
+        b = num(p1); h = num(p2)
+        return [("Area", 2, (b * h / 2, zero), False)]
+    elif sel == "Pythagoras (Hypotenuse)":
+        if not p1 or not p2:
+            raise MissingInput("Enter both legs.")
+        a = num(p1); b = num(p2)
+        return [("Hypotenuse", 1, _hypot(a, b), False)]
+    elif sel == "Rhombus":
+        if not p1 or not p2:
+            raise MissingInput("Enter both diagonals.")
+        d1 = num(p1); d2 = num(p2)
+        # side from half-diagonals: 4 * sqrt((d1/2)^2 + (d2/2)^2) == 2 * sqrt(d1^2 + d2^2)
+        peri = _scale(_hypot(d1, d2), 2)
+        return [("Area", 2, (d1 * d2 / 2, zero), False), ("Perimeter", 1, peri, False)]
+    elif sel == "Ellipse":
+        if not p1 or not p2:
+            raise MissingInput("Enter semi-major (a) and semi-minor (b).")
+        a = num(p1); b = num(p2)
+        # Ramanujan's approximation for circumference
+        if _precision is not None:
+            ctx = _context_for(_precision + 3)
+            with decimal.localcontext(ctx):
+                h = _pair_decimal((((a - b)**2) / ((a + b)**2) if (a + b) != 0 else zero, zero), ctx)
+                circ = _pair_decimal((zero, a + b), ctx) * (1 + (3*h)/(10 + (4 - 3*h).sqrt()))
+            circ = _decimal_context().plus(circ)
+        else:
+            af = float(a); bf = float(b)
+            h = ((af - bf)**2) / ((af + bf)**2) if (af + bf) != 0 else 0
+            circ = math.pi * (af + bf) * (1 + (3*h)/(10 + math.sqrt(4 - 3*h)))
+        return [("Area", 2, (zero, a * b), False), ("Circumference", 1, circ, True)]
+    elif sel == "Polygon (vertices)":
+        if not p1:
+            raise MissingInput("Enter vertices as x,y; x,y; ...")
+        coords, starts, scale = parse_polygons([p1])
+        areas, perimeters = polygon_measures(coords, starts, scale)
+        if not exact:
+            return [("Area", 2, float(areas[0]), False), ("Perimeter", 1, perimeters[0], False)]
+        unit = Fraction(1, 10 ** scale)
+        peri = _polygon_perimeter_exact([c * unit for c in coords]) or perimeters[0]
+        return [("Area", 2, (areas[0], zero), False), ("Perimeter", 1, peri, False)]
+    elif sel == "Regular Polygon":
+        if not p1 or not p2:
+            raise MissingInput("Enter number of sides and side length.")
+        n = parse_number(p1)
+        if n.denominator != 1 or n < 3:
+            raise ValueError("Number of sides must be a whole number of at least 3.")
+        n = int(n); s = num(p2)
+        if _precision is not None:
+            ctx = _decimal_context()
+            tan = _decimal_tan(ctx.divide(pi_decimal(_precision + 3), n))
+            area = ctx.divide(to_decimal(n * s * s), ctx.multiply(4, tan))
+        else:
+            area = n * float(s) ** 2 / (4 * math.tan(math.pi / n))
+        return [("Area", 2, area, False), ("Perimeter", 1, (n * s, zero), False)]
+    elif sel == "Sector":
+        if not p1 or not p2:
+            raise MissingInput("Enter radius and angle (degrees).")
+        r = num(p1); angle = num(p2)
+        # arc = angle/180 * pi * r, area = angle/360 * pi * r^2
+        return [("Area", 2, (zero, angle * r * r / 360), False),
+                ("Arc Length", 1, (zero, angle * r / 180), False),
+                ("Perimeter", 1, (2 * r, angle * r / 180), False)]
+    elif sel == "Sphere":
+        if not p1:
+            raise MissingInput("Enter radius.")
+        r = num(p1)
+        return [("Volume", 3, (zero, 4 * r * r * r / 3), False), ("Surface Area", 2, (zero, 4 * r * r), False)]
+    elif sel == "Cylinder":
+        if not p1 or not p2:
+            raise MissingInput("Enter radius and height.")
+        r = num(p1); h = num(p2)
+        return [("Volume", 3, (zero, r * r * h), False),
+                ("Surface Area", 2, (zero, 2 * r * r + 2 * r * h), False)]
+    elif sel == "Cone":
+        if not p1 or not p2:
+            raise MissingInput("Enter radius and height.")
+        r = num(p1); h = num(p2)
+        slant = _hypot(r, h)
+        if isinstance(slant, tuple):
+            surface = (zero, r * r + r * slant[0])
+        elif isinstance(slant, Decimal):
+            # pi * r * (r + slant) from guard-digit parts, rounded once
+            ctx = _context_for(_precision + 3)
+            rd = ctx.divide(Decimal(r.numerator), Decimal(r.denominator))
+            sq = r * r + h * h
+            slant_g = ctx.sqrt(ctx.divide(Decimal(sq.numerator), Decimal(sq.denominator)))
+            surface = _decimal_context().plus(
+                ctx.multiply(ctx.multiply(pi_decimal(ctx.prec), rd), ctx.add(rd, slant_g)))
+        else:
+            surface = math.pi * float(r) * (float(r) + slant)
+        return [("Volume", 3, (zero, r * r * h / 3), False),
+                ("Surface Area", 2, surface, False), ("Slant Height", 1, slant, False)]
+    elif sel == "Prism":
+        if not p1 or not p3:
+            raise MissingInput("Enter base area and height (base perimeter optional for surface area).")
+        base = num(p1); h = num(p3)
+        if p2:
+            surface = (2 * base + num(p2) * h, zero)
+        else:
+            surface = "(need base perimeter)"
+        return [("Volume", 3, (base * h, zero), False), ("Surface Area", 2, surface, False)]
+    return None
+
+def compute_geometry(sel, p1="", p2="", p3="", exact=False, unit="", out_unit=""):
+    """Return the result text for shape `sel` given up to three parameter strings.
+
+    exact=True keeps Fractions and shows multiples of pi symbolically ("12π");
+    `unit` is the unit of the inputs and `out_unit` the unit to show results in.
+    """
+    measures = geometry_measures(sel, p1, p2, p3, exact or _precision is not None)
+    if measures is None:
+        return "Unknown shape."
+    if not unit:
+        out_unit = ""
+    out_unit = out_unit or unit
+    parts = []
+    for label, dim, value, approx in measures:
+        if isinstance(value, str):
+            parts.append(f"{label} = {value}")
+            continue
+        if out_unit != unit:
+            value = _scale(value, unit_factor(unit, out_unit, dim))
+        if exact and isinstance(value, tuple):
+            text = format_pi(value)
+        else:
+            text = measure_str(value)
+            approx = approx or exact
+        suffix = f" {out_unit}{_DIM_SUFFIX[dim]}" if out_unit else ""
+        parts.append(f"{label} {'≈' if approx else '='} {text}{suffix}")
+    return "   ".join(parts)
+
+def total_area(rows, out_unit=""):
+    """Exact total area of many shapes as a (rational, pi_coefficient) pair.
+
+    rows: (sel, p1, p2, p3, unit) tuples. Areas are summed per input unit and
+    each unit's subtotal is converted once. When some area has no exact form
+    (Regular Polygon), the total is a float, or a Decimal at the precision
+    setting, instead of a pair.
+    """
+    by_unit = {}
+    for sel, p1, p2, p3, unit in rows:
+        measures = geometry_measures(sel, p1, p2, p3)
+        if measures is None:
+            raise ValueError(f"Unknown shape: {sel}")
+        area = next((m[2] for m in measures if m[0] == "Area"), None)
+        if area is None:
+            raise ValueError(f"{sel} has no area.")
+        by_unit.setdefault(unit, []).append(area)
+    if not out_unit and len(by_unit) > 1:
+        raise ValueError("Choose an output unit to add areas given in different units.")
+    subtotals = []
+    approx = []  # float/Decimal areas, kept apart from the exact pairs
+    for unit, areas in by_unit.items():
+        pairs = [a for a in areas if isinstance(a, tuple)]
+        subtotals.extend(convert_measures([sum_measures(pairs)], unit, out_unit, 2))
+        approx.extend(convert_measures([a for a in areas if not isinstance(a, tuple)], unit, out_unit, 2))
+    total = sum_measures(subtotals)
+    if not approx:
+        return total
+    if _precision is None:
+        return math.fsum([measure_float(total)] + approx)
+    ctx = _context_for(_precision + 3)
+    result = _pair_decimal(total, ctx)
+    for a in approx:
+        result = ctx.add(result, a)
+    return _decimal_context().plus(result)
@@ -0,0 +1,146 @@
+"""Load generator for NumberServer: latency percentiles and throughput on localhost.
+
+  python NumberLoad.py --spawn                      # start a server on a free port, then load it
+  python NumberLoad.py --port 8765 --connections 64 --requests 20000 --op parse
+
+Each connection is a keep-alive client sending requests back to back;
+--op mix cycles through all operations with small synthetic payloads.
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+from NumberBench import mixed_inputs, equations, geometry_params
+
+
+def make_payloads(op, count):
+    """Return [(op, body bytes)] of `count` synthetic requests."""
+    values = mixed_inputs(count)
+    eqs = equations(count)
+    geoms = geometry_params(count)
+    makers = {
+        "parse": lambda i: {"value": values[i]},
+        "stats": lambda i: {"numbers": values[i:i + 20]},
+        "sort": lambda i: {"numbers": values[i:i + 20]},
+        "solve": lambda i: {"equation": eqs[i]},
+        "geometry": lambda i: {"shape": geoms[i][0], "params": list(geoms[i][1:])},
+        "calc": lambda i: {"expression": f"{i}*3/7+{i % 13}**2"},
+    }
+    ops = list(makers) if op == "mix" else [op]
+    out = []
+    for i in range(count):
+        name = ops[i % len(ops)]
+        out.append((name, json.dumps(makers[name](i)).encode()))
+    return out
+
+
+async def _client(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                op, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            request = (f"POST /{op} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                h = await reader.readline()
+                if h in (b"\r\n", b""):
+                    break
+                name, _, value = h.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(status_line.split()[1])
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def run_load(host, port, op, requests, connections):
+    queue = asyncio.Queue()
+    for item in make_payloads(op, requests):
+        queue.put_nowait(item)
+    latencies = []
+    errors = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, queue, latencies, errors) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"requests: {len(latencies)}  connections: {connections}  op: {op}")
+    print(f"throughput: {len(latencies) / elapsed:.0f} req/s over {elapsed:.2f}s")
+    print("latency ms: " + "  ".join(f"p{p}={percentile(latencies, p) * 1e3:.2f}" for p in (50, 90, 99))
+          + f"  max={latencies[-1] * 1e3 if latencies else 0:.2f}")
+    if errors:
+        print("non-200 responses: " + ", ".join(f"{k}: {v}" for k, v in sorted(errors.items())))
+    return 1 if errors else 0
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server on {host}:{port} did not start")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="NumberServer load generator")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--op", default="mix", choices=("mix", "parse", "stats", "sort", "solve", "geometry", "calc"))
+    ap.add_argument("--requests", type=int, default=5000)
+    ap.add_argument("--connections", type=int, default=32)
+    ap.add_argument("--spawn", action="store_true", help="start NumberServer.py on a free port for the run")
+    ap.add_argument("--workers", type=int, help="pool size for the spawned server")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.spawn:
+        args.port = _free_port()
+        cmd = [sys.executable, "NumberServer.py", "--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            cmd += ["--workers", str(args.workers)]
+        proc = subprocess.Popen(cmd, cwd=sys.path[0] or None, stdout=subprocess.DEVNULL)
+        _wait_for_port(args.host, args.port)
+    try:
+        return asyncio.run(run_load(args.host, args.port, args.op, args.requests, args.connections))
+    finally:
+        if proc is not None:
+            proc.terminate()  # the server shuts its worker pool down on SIGTERM
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
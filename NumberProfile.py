@@ -0,0 +1,210 @@
+"""Optional timing instrumentation for the NumberTool handlers.
+
+Disabled by default; a wrapped call then costs one global check. Enable with
+the environment variable NUMBERTOOL_PROFILE=1 (timings) or
+NUMBERTOOL_PROFILE=cprofile (timings plus a cProfile capture), or call
+enable() directly. Results are written on exit to NUMBERTOOL_PROFILE_OUT
+(default numbertool_profile.json, plus a .prof file for cProfile) and can be
+dumped any time with dump().
+
+Each handler call is split into parse / compute / format time (measured by
+the helpers wrapped with timed()) and ui time, which is whatever is left of
+the handler's total. Phases nest: a parse inside a compute helper counts as
+parse, and only the rest of the helper's time as compute.
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import re
+import time
+
+PHASES = ("parse", "compute", "format", "ui")
+
+_enabled = False
+_profiler = None
+_current = None  # phase totals of the handler call in progress
+_nested = None  # [seconds] spent in phases nested inside the innermost running phase
+_stats = {}
+_startup = None
+
+# startup budget (ms) checked by record_startup()
+STARTUP_TARGET_MS = float(os.environ.get("NUMBERTOOL_STARTUP_TARGET_MS", "300"))
+
+
+# ---------- control ----------
+def enable(cprofile=False):
+    global _enabled, _profiler
+    _enabled = True
+    if cprofile and _profiler is None:
+        _profiler = cProfile.Profile()
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    global _profiler
+    _stats.clear()
+    if _profiler is not None:
+        _profiler = cProfile.Profile()
+
+
+# ---------- wrappers ----------
+def instrument(fn):
+    """Decorator for UI handlers: records total time, phase split and input size per call."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        global _current
+        if not _enabled or _current is not None:
+            return fn(*args, **kwargs)
+        rec = _current = {"parse": 0.0, "compute": 0.0, "format": 0.0, "size": 1}
+        prof = _profiler
+        start = time.perf_counter()
+        try:
+            if prof is not None:
+                prof.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if prof is not None:
+                    prof.disable()
+        finally:
+            total = time.perf_counter() - start
+            _current = None
+            _record(name, rec, total)
+    return wrapper
+
+def _enter():
+    global _nested
+    outer = _nested
+    _nested = [0.0]
+    return outer, time.perf_counter()
+
+def _leave(rec, name, token):
+    # the phase gets its time minus the phases nested in it; the enclosing phase sees it as nested
+    global _nested
+    outer, start = token
+    elapsed = time.perf_counter() - start
+    rec[name] += elapsed - _nested[0]
+    _nested = outer
+    if outer is not None:
+        outer[0] += elapsed
+
+def timed(phase, fn):
+    """Wrap helper `fn` so its time counts towards `phase` of the running handler."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        rec = _current
+        if rec is None:
+            return fn(*args, **kwargs)
+        token = _enter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _leave(rec, phase, token)
+    return wrapper
+
+class phase:
+    """Context manager for inline work: `with phase("compute"): ...`."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.rec = _current
+        if self.rec is not None:
+            self.token = _enter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.rec is not None:
+            _leave(self.rec, self.name, self.token)
+        return False
+
+def note_size(size):
+    """Record the input size (number of values) of the handler call in progress."""
+    if _current is not None:
+        _current["size"] = size
+
+_NUMBER = re.compile(r"\d+(?:\.\d*)?|\.\d+")
+
+def note_text_size(*texts):
+    """note_size() with the count of numbers written in `texts` (counted only while profiling)."""
+    if _current is not None:
+        _current["size"] = sum(len(_NUMBER.findall(t)) for t in texts)
+
+
+def record_startup(seconds):
+    """Startup timing hook: store the time to the first painted frame.
+
+    Printed against STARTUP_TARGET_MS when profiling is enabled.
+    """
+    global _startup
+    _startup = seconds
+    if _enabled:
+        verdict = "ok" if seconds * 1e3 <= STARTUP_TARGET_MS else "OVER TARGET"
+        print(f"startup: {seconds * 1e3:.1f} ms (target {STARTUP_TARGET_MS:.0f} ms) {verdict}")
+
+
+# ---------- aggregation / export ----------
+def _record(name, rec, total):
+    st = _stats.get(name)
+    if st is None:
+        st = _stats[name] = {"calls": 0, "total": 0.0, "size_total": 0, "size_max": 0, "hist_us": {}}
+        for p in PHASES:
+            st[p] = 0.0
+    st["calls"] += 1
+    st["total"] += total
+    for p in ("parse", "compute", "format"):
+        st[p] += rec[p]
+    st["ui"] += max(0.0, total - rec["parse"] - rec["compute"] - rec["format"])
+    st["size_total"] += rec["size"]
+    st["size_max"] = max(st["size_max"], rec["size"])
+    # power-of-two microsecond buckets: key k counts calls in [2**(k-1), 2**k) us
+    bucket = int(total * 1e6).bit_length()
+    st["hist_us"][bucket] = st["hist_us"].get(bucket, 0) + 1
+
+def snapshot():
+    """Return a JSON-ready copy of the counters and histograms per handler.
+
+    Phase times are in seconds; histogram keys are bucket upper bounds in us.
+    """
+    out = {}
+    for name, st in _stats.items():
+        d = dict(st)
+        d["hist_us"] = {str(1 << k): c for k, c in sorted(st["hist_us"].items())}
+        out[name] = d
+    if _startup is not None:
+        out["startup"] = {"ms": _startup * 1e3, "target_ms": STARTUP_TARGET_MS}
+    return out
+
+def report():
+    lines = [f"{'handler':<22}{'calls':>7}{'total ms':>11}" + "".join(f"{p + ' ms':>12}" for p in PHASES) + f"{'max size':>10}"]
+    for name, st in sorted(_stats.items(), key=lambda kv: -kv[1]["total"]):
+        lines.append(f"{name:<22}{st['calls']:>7}{st['total'] * 1e3:>11.2f}"
+                     + "".join(f"{st[p] * 1e3:>12.2f}" for p in PHASES) + f"{st['size_max']:>10}")
+    if _startup is not None:
+        lines.append(f"startup: {_startup * 1e3:.1f} ms (target {STARTUP_TARGET_MS:.0f} ms)")
+    return "\n".join(lines)
+
+def dump(path=None):
+    """Write snapshot() as JSON (and the cProfile stats next to it, if captured)."""
+    path = path or os.environ.get("NUMBERTOOL_PROFILE_OUT", "numbertool_profile.json")
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+    if _profiler is not None:
+        _profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+    return path
+
+
+_mode = os.environ.get("NUMBERTOOL_PROFILE", "").strip().lower()
+if _mode and _mode != "0":
+    enable(cprofile=(_mode == "cprofile"))
+    atexit.register(dump)
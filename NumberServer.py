@@ -0,0 +1,337 @@
+"""Local HTTP/JSON service exposing the NumberCore operations.
+
+  python NumberServer.py --port 8765 --workers 4
+
+POST /<op> with a JSON object body; the answer is {"result": ...} or
+{"error": "..."}. GET /health and GET /ops are also available.
+
+  parse     {"value": "-3 6/7"}
+  stats     {"numbers": ["1", "2/3", "50%"]}     (or one comma-separated string)
+  sort      {"numbers": [...], "reverse": false}
+  solve     {"equation": "2x+3=7"}
+  geometry  {"shape": "Rectangle", "params": ["3", "1/2"]}
+  calc      {"expression": "7/2+3"}
+
+The work runs in a process pool. Small requests for the same operation that
+arrive within --batch-delay-ms of each other are sent to the pool as one bulk
+call (at most --batch-max items). More than --max-inflight requests in flight
+get 503, and a request not answered within --timeout seconds gets 504. A
+timed-out request keeps its in-flight slot until the pool is done with it;
+new work goes to a fresh pool and the stuck one is killed a timeout later.
+Stdlib only (asyncio streams with a minimal HTTP/1.1 keep-alive server).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+import sys
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+from NumberCore import (
+    parse_number, NumberBatch, fraction_to_decimal_str, fraction_to_percent_str,
+    solve_linear_equation, compute_geometry, evaluate_expression,
+)
+
+MAX_BODY = 16 * 1024 * 1024
+SMALL_BODY = 4096  # requests up to this size are micro-batched
+IDLE_TIMEOUT = 30.0
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error",
+            503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+# ---------- operations (run inside the worker processes) ----------
+def _numbers(payload):
+    numbers = payload.get("numbers", [])
+    if isinstance(numbers, str):
+        return numbers.split(',')
+    return [str(n) for n in numbers]
+
+def op_parse(payload):
+    frac = parse_number(str(payload["value"]))
+    return {"fraction": str(frac), "decimal": fraction_to_decimal_str(frac),
+            "percent": fraction_to_percent_str(frac)}
+
+def op_stats(payload):
+    batch = NumberBatch.from_strings(_numbers(payload))
+    if not len(batch):
+        raise ValueError("No valid numbers to calculate stats.")
+    mean_val, median_val, range_val = batch.stats()
+    return {"count": len(batch), "mean": fraction_to_decimal_str(mean_val),
+            "median": fraction_to_decimal_str(median_val), "range": fraction_to_decimal_str(range_val)}
+
+def op_sort(payload):
+    batch = NumberBatch.from_strings(_numbers(payload))
+    order = batch.sort_order(reverse=bool(payload.get("reverse", False)))
+    return list(batch.iter_spellings(order))
+
+def op_solve(payload):
+    status, msg, sol = solve_linear_equation(str(payload["equation"]))
+    if status == 'error':
+        raise ValueError(msg)
+    return {"status": status, "message": msg, "solution": None if sol is None else str(sol)}
+
+def op_geometry(payload):
+    params = [str(p) for p in payload.get("params", [])][:3]
+    return compute_geometry(str(payload["shape"]), *params)
+
+def op_calc(payload):
+    return str(evaluate_expression(str(payload["expression"])))
+
+OPS = {
+    "parse": op_parse,
+    "stats": op_stats,
+    "sort": op_sort,
+    "solve": op_solve,
+    "geometry": op_geometry,
+    "calc": op_calc,
+}
+
+def run_batch(op, payloads):
+    """Bulk entry point for the pool: one (ok, result-or-message) pair per payload."""
+    fn = OPS[op]
+    out = []
+    for payload in payloads:
+        try:
+            out.append((True, fn(payload)))
+        except Exception as e:  # one bad payload only fails itself, not the whole batch
+            if isinstance(e, KeyError):
+                msg = f"missing field {e}"
+            elif isinstance(e, (ValueError, ArithmeticError, TypeError)):
+                msg = str(e)
+            else:
+                msg = f"{type(e).__name__}: {e}"
+            out.append((False, msg))
+    return out
+
+
+# ---------- micro-batching ----------
+class Batcher:
+    """Collects small same-op requests and sends them to the pool together."""
+
+    def __init__(self, pool, max_size=64, max_delay=0.002):
+        self.pool = pool
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.pending = {}  # op -> [(payload, future)]
+        self.timers = {}
+
+    def submit(self, op, payload):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        items = self.pending.setdefault(op, [])
+        items.append((payload, fut))
+        if len(items) >= self.max_size:
+            self.flush(op)
+        elif op not in self.timers:
+            self.timers[op] = loop.call_later(self.max_delay, self.flush, op)
+        return fut
+
+    def submit_single(self, op, payload):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._dispatch(op, [(payload, fut)])
+        return fut
+
+    def flush(self, op):
+        timer = self.timers.pop(op, None)
+        if timer is not None:
+            timer.cancel()
+        items = self.pending.pop(op, None)
+        if items:
+            self._dispatch(op, items)
+
+    def _dispatch(self, op, items):
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(self.pool, run_batch, op, [p for p, _ in items])
+        task.add_done_callback(lambda t: self._resolve(items, t))
+
+    @staticmethod
+    def _resolve(items, task):
+        exc = task.exception()
+        for i, (_, fut) in enumerate(items):
+            if fut.done():  # timed out / client gone
+                continue
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(task.result()[i])
+
+
+# ---------- HTTP ----------
+def _new_pool(workers):
+    """Process pool whose workers do not inherit the server's sockets.
+
+    Workers start lazily (and again after a recycle) while connections are
+    open; forked ones would keep those sockets, so a closed connection would
+    send no FIN until the worker exits.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+class NumberServer:
+    def __init__(self, workers=None, batch_max=64, batch_delay=0.002, max_inflight=1024, timeout=10.0):
+        self.pool = _new_pool(workers)
+        self.batcher = Batcher(self.pool, batch_max, batch_delay)
+        self.max_inflight = max_inflight
+        self.timeout = timeout
+        self.workers = workers
+        self.inflight = 0
+        self.retired = []  # pools replaced after a timeout, killed once their work is due
+
+    def _release(self, fut):
+        if not fut.cancelled():
+            fut.exception()  # retrieved; nobody is waiting for it any more
+        self.inflight -= 1
+
+    def _recycle_pool(self):
+        """Send new work to a fresh pool and kill the one holding the runaway task.
+
+        Everything still queued on the old pool was submitted before now, so
+        after one more timeout period every request using it has either been
+        answered or already got its 504; then its workers are killed and the
+        abandoned requests release their in-flight slots.
+        """
+        old = self.pool
+        self.pool = self.batcher.pool = _new_pool(self.workers)
+        self.retired.append(old)
+        asyncio.get_running_loop().call_later(self.timeout, self._kill_pool, old)
+
+    def _kill_pool(self, pool, wait=False):
+        if pool in self.retired:
+            self.retired.remove(pool)
+        for proc in list((pool._processes or {}).values()):
+            proc.kill()
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+    async def dispatch(self, method, path, body):
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        if method == "GET" and path == "/health":
+            return 200, {"result": "ok", "inflight": self.inflight}
+        if method == "GET" and path == "/ops":
+            return 200, {"result": sorted(OPS)}
+        op = path.lstrip('/')
+        if op not in OPS:
+            return 404, {"error": f"unknown operation: {op}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if self.inflight >= self.max_inflight:
+            return 503, {"error": "server busy, retry later"}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "body is not valid JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        self.inflight += 1
+        pool = self.pool
+        fut = None
+        try:
+            if len(body) <= SMALL_BODY:
+                fut = self.batcher.submit(op, payload)
+            else:
+                fut = self.batcher.submit_single(op, payload)
+            # shield: on timeout the future stays pending until the pool is done with it
+            ok, result = await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+        except asyncio.TimeoutError:
+            if pool is self.pool:
+                self._recycle_pool()
+            return 504, {"error": f"timed out after {self.timeout}s"}
+        except Exception as e:  # e.g. a broken worker pool
+            if isinstance(e, BrokenExecutor) and pool is self.pool:
+                self._recycle_pool()
+            return 500, {"error": f"internal error: {e}"}
+        finally:
+            # the slot is held until the work really finishes, so 503s track pool load
+            if fut is None or fut.done():
+                self.inflight -= 1
+            else:
+                fut.add_done_callback(self._release)
+        if ok:
+            return 200, {"result": result}
+        return 400, {"error": result}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not line:
+                    break
+                method, path, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = h.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": "request body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.dispatch(method, path, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+        if status == 503:
+            head += "Retry-After: 1\r\n"
+        writer.write(head.encode() + b"\r\n" + body)
+        await writer.drain()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port)
+        addr = server.sockets[0].getsockname()
+        print(f"NumberServer listening on http://{addr[0]}:{addr[1]}", flush=True)
+        stop = asyncio.Event()
+        try:
+            # SIGTERM (e.g. from NumberLoad --spawn) stops like Ctrl-C, so the pool goes with us
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        except (NotImplementedError, AttributeError):  # Windows
+            pass
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            # kill rather than wait: a runaway request would otherwise hold up the exit
+            for pool in self.retired + [self.pool]:
+                self._kill_pool(pool, wait=True)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="NumberTool HTTP/JSON service")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=None, help="pool processes (default: CPU count)")
+    ap.add_argument("--batch-max", type=int, default=64)
+    ap.add_argument("--batch-delay-ms", type=float, default=2.0)
+    ap.add_argument("--max-inflight", type=int, default=1024)
+    ap.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    args = ap.parse_args(argv)
+    server = NumberServer(args.workers, args.batch_max, args.batch_delay_ms / 1000.0,
+                          args.max_inflight, args.timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
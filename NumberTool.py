@@ -1,49 +1,51 @@
-import tkinter as tk
-from tkinter import messagebox
+import time
+_t_start = time.perf_counter()  # startup timing hook reference point
+
 from fractions import Fraction
-from decimal import Decimal, InvalidOperation
-import math
-import re
-
-# ---------- parsing / math utilities ----------
-def parse_number(num_str):
-    """Convert a number string (decimal, fraction, percent, whole, or mixed like '-3 6/7') to Fraction."""
-    s = num_str.strip()
-    if not s:
-        raise ValueError("Empty number")
-    try:
-        if s.endswith('%'):
-            val = Decimal(s[:-1])
-            return Fraction(val / Decimal(100))
-        if ' ' in s and '/' in s:
-            parts = s.split()
-            if len(parts) == 2:
-                whole_str, frac_str = parts
-                sign = -1 if whole_str.startswith('-') else 1
-                whole = int(whole_str.lstrip('+-'))
-                num_str2, den_str = frac_str.split('/', 1)
-                num = int(num_str2)
-                den = int(den_str)
-                if den == 0:
-                    raise ZeroDivisionError("Denominator cannot be zero")
-                return Fraction(sign * (whole * den + num), den)
-        if '/' in s:
-            return Fraction(s)
-        try:
-            d = Decimal(s)
-            return Fraction(d)
-        except InvalidOperation:
-            return Fraction(float(s))
-    except (ValueError, ZeroDivisionError, InvalidOperation) as e:
-        raise ValueError(f"Invalid number: {num_str}") from e
+import tkinter as tk
+from tkinter import messagebox, filedialog
+
+from NumberCore import (
+    parse_number, NumberBatch,
+    fraction_to_decimal_str, fraction_to_percent_str,
+    solve_linear_equation, compute_geometry, UNITS, MissingInput,
+    evaluate_expression, sqrt_str, rules_map, exponent_rule, exponent_evaluate,
+    set_precision, approx_str, format_value, set_snap,
+)
+import NumberCache
+import NumberCore
+import NumberProfile
+from NumberProfile import instrument, phase, note_size, note_text_size
+
+# persistent results for the costly helpers (NUMBERTOOL_CACHE=1)
+fraction_to_decimal_str = NumberCache.cached("decimal", fraction_to_decimal_str, NumberCache.decimal_key)
+sqrt_str = NumberCache.cached("sqrt", sqrt_str, NumberCache.sqrt_key)
+exponent_evaluate = NumberCache.cached("exponent", exponent_evaluate, NumberCache.exponent_key)
+
+# route helper time into the profiler's parse / compute / format phases; the
+# core helpers look parse_number / parse_polygons up in NumberCore, so their
+# own parsing is counted as parse too
+parse_number = NumberCore.parse_number = NumberProfile.timed("parse", parse_number)
+NumberCore.parse_polygons = NumberProfile.timed("parse", NumberCore.parse_polygons)
+solve_linear_equation = NumberProfile.timed("compute", solve_linear_equation)
+compute_geometry = NumberProfile.timed("compute", compute_geometry)
+fraction_to_decimal_str = NumberProfile.timed("format", fraction_to_decimal_str)
+fraction_to_percent_str = NumberProfile.timed("format", fraction_to_percent_str)
+evaluate_expression = NumberProfile.timed("compute", evaluate_expression)
+sqrt_str = NumberProfile.timed("compute", sqrt_str)
+exponent_rule = NumberProfile.timed("compute", exponent_rule)
+exponent_evaluate = NumberProfile.timed("compute", exponent_evaluate)
+
 #calc
+@instrument
 def calc_click(char):
     if char == "C":
         calc_display.delete(0, tk.END)
     elif char == "=":
         try:
             expr = calc_display.get()
-            result = eval(expr, {"__builtins__": None}, {})
+            note_text_size(expr)
+            result = evaluate_expression(expr)
             calc_display.delete(0, tk.END)
             calc_display.insert(tk.END, str(result))
         except Exception:
@@ -53,77 +55,26 @@ def calc_click(char):
 
 
 
-#mmr 
-def calculate_stats(numbers):
-    """numbers: list of strings; returns (mean, median, range) as Fractions"""
-    nums = [parse_number(n) for n in numbers if n.strip()]
-    if not nums:
-        raise ValueError("No valid numbers to calculate stats.")
-
-    nums_sorted = sorted(nums)
-    n = len(nums)
-
-    # mean
-    mean_val = sum(nums) / n
-
-    # median
-    mid = n // 2
-    if n % 2 == 1:
-        median_val = nums_sorted[mid]
-    else:
-        median_val = (nums_sorted[mid - 1] + nums_sorted[mid]) / 2
-
-    # range
-    range_val = nums_sorted[-1] - nums_sorted[0]
-
-    return mean_val, median_val, range_val
-
-
-
-def sort_numbers(numbers, reverse=False):
-    """Sort list of number strings in ascending or descending order.
-    Preserve the original (unsimplified) string representation in the output.
-    """
-    parsed = []
-    for n in numbers:
-        orig = n.strip()
-        if orig == "":
-            continue
-        val = parse_number(orig)
-        parsed.append((val, orig))
-    parsed.sort(key=lambda t: t[0], reverse=reverse)
-    return [t[1] for t in parsed]
-
-def fraction_to_decimal_str(frac: Fraction):
-    dec = Decimal(frac.numerator) / Decimal(frac.denominator)
-    s = format(dec, 'f')
-    if '.' in s:
-        s = s.rstrip('0').rstrip('.')
-    return s
-
-def fraction_to_percent_str(frac: Fraction):
-    dec = Decimal(frac.numerator) / Decimal(frac.denominator)
-    percent = dec * Decimal(100)
-    s = format(percent, 'f')
-    if '.' in s:
-        s = s.rstrip('0').rstrip('.')
-    return s + '%'
-
 # ---------- UI actions ----------
+@instrument
 def on_sort():
     input_text = entry.get()
     if not input_text.strip():
         messagebox.showwarning("Input Error", "Please enter some numbers separated by commas.")
         return
-    numbers = input_text.split(',')
     try:
-        least_to_greatest = sort_numbers(numbers)
-        greatest_to_least = sort_numbers(numbers, reverse=True)
-        result_ltog.config(text=", ".join(least_to_greatest))
-        result_gtol.config(text=", ".join(greatest_to_least))
+        with phase("parse"):
+            batch = NumberBatch.from_text(input_text)
+        note_size(len(batch))
+        with phase("compute"):
+            least_to_greatest = batch.sort_order()
+            greatest_to_least = batch.sort_order(reverse=True)
+        result_ltog.show(batch, least_to_greatest)
+        result_gtol.show(batch, greatest_to_least)
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
 
+@instrument
 def on_convert():
     s = convert_entry.get()
     if not s.strip():
@@ -131,12 +82,20 @@ def on_convert():
         return
     try:
         frac = parse_number(s)
-        conv_frac.config(text=str(frac))
-        conv_decimal.config(text=fraction_to_decimal_str(frac))
-        conv_percent.config(text=fraction_to_percent_str(frac))
+        frac_text = str(frac)
+        dec_text = fraction_to_decimal_str(frac)
+        pct_text = fraction_to_percent_str(frac)
+        with phase("format"):
+            extra_texts = [format_value(spec, frac) for spec in ("mixed", "sci", "nearest:16")]
+        conv_frac.config(text=frac_text)
+        conv_decimal.config(text=dec_text)
+        conv_percent.config(text=pct_text)
+        for label, text in zip((conv_mixed, conv_sci, conv_nearest), extra_texts):
+            label.config(text=text)
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
 
+@instrument
 def on_sqrt():
     s = sqrt_entry.get().strip()
     if not s:
@@ -144,221 +103,56 @@ def on_sqrt():
         return
     try:
         frac = parse_number(s)
-        val = float(frac.numerator) / float(frac.denominator)
-        if val < 0:
+        if frac < 0:
             messagebox.showerror("Math Error", "Cannot take square root of a negative number.")
             return
-        root = math.sqrt(val)
-        if abs(root - round(root)) < 1e-12:
-            root_str = str(int(round(root)))
-        else:
-            root_str = f"{root:.12g}"
-        sqrt_result.config(text=root_str)
+        sqrt_result.config(text=sqrt_str(frac))
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
 
-# Exponent rule (symbolic only)
-def format_exp(frac: Fraction):
-    if frac.denominator == 1:
-        return str(frac.numerator)
-    return f"{frac.numerator}/{frac.denominator}"
-
-def try_parse_exponent(es):
-    es = es.strip()
-    if es == "":
-        raise ValueError("Exponent is empty")
-    return parse_number(es)
 
+@instrument
 def on_exponent_rule():
-    base_text = base_entry.get().strip()
-    e1_text = exp1_entry.get().strip()
-    e2_text = exp2_entry.get().strip()
-    rule_label = rule_var.get()
-    if not base_text:
-        from tkinter import messagebox
-        messagebox.showwarning("Input Error", "Enter a base (number or symbol).")
-        return
+    rule_code = rules_map[rule_var.get()]
+    note_text_size(base_entry.get(), exp1_entry.get(), exp2_entry.get())
     try:
-        rule_code = rules_map[rule_label]
-
-        # NEW: Negative exponent rule (uses exponent 1 if present, otherwise exponent 2)
-        if rule_code == "negative_exponent":
-            es = e1_text or e2_text
-            if not es:
-                messagebox.showwarning("Input Error", "Enter an exponent (negative integer).")
-                return
-            e = try_parse_exponent(es)
-            # require a negative integer (denominator == 1 and numerator < 0)
-            if e.denominator != 1 or e.numerator >= 0:
-                messagebox.showwarning("Input Error", "Exponent must be a negative integer for this rule.")
-                return
-            pos = Fraction(-e.numerator, 1)
-            expr = f"{base_text}^{format_exp(e)} = 1/{base_text}^{format_exp(pos)}"
-            result_expr.config(text=expr)
-            result_numeric.config(text="(symbolic only)")
-            return
-
-        # existing symbolic rules (unchanged)
-        e1 = try_parse_exponent(e1_text)
-        e2 = try_parse_exponent(e2_text)
-
-        if rule_code == "power_of_power":
-            result_exp = e1 * e2
-            expr = f"({base_text}^{format_exp(e1)})^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
-        elif rule_code == "multiply_same_base":
-            result_exp = e1 + e2
-            expr = f"{base_text}^{format_exp(e1)} * {base_text}^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
-        elif rule_code == "divide_same_base":
-            result_exp = e1 - e2
-            expr = f"{base_text}^{format_exp(e1)} / {base_text}^{format_exp(e2)} = {base_text}^{format_exp(result_exp)}"
-        else:
-            expr = "Unknown rule"
-
+        expr = exponent_rule(rule_code, base_entry.get(), exp1_entry.get(), exp2_entry.get())
         result_expr.config(text=expr)
         result_numeric.config(text="(symbolic only)")
+    except MissingInput as e:
+        messagebox.showwarning("Input Error", str(e))
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
 
 # --- NEW: Evaluate numeric result button handler ---
+@instrument
 def on_exponent_evaluate():
-    base_text = base_entry.get().strip()
-    e1_text = exp1_entry.get().strip()
-    e2_text = exp2_entry.get().strip()
-    rule_label = rule_var.get()
-    if not base_text:
-        messagebox.showwarning("Input Error", "Enter a base (number or symbol).")
-        return
+    rule_code = rules_map[rule_var.get()]
+    note_text_size(base_entry.get(), exp1_entry.get(), exp2_entry.get())
     try:
-        rule_code = rules_map[rule_label]
-
-        # attempt to parse base as numeric Fraction
-        try:
-            base_frac = parse_number(base_text)
-            base_num = float(base_frac.numerator) / float(base_frac.denominator)
-            base_is_numeric = True
-        except ValueError:
-            base_is_numeric = False
-
-        # Negative exponent numeric evaluation
-        if rule_code == "negative_exponent":
-            es = e1_text or e2_text
-            if not es:
-                messagebox.showwarning("Input Error", "Enter an exponent (negative integer).")
-                return
-            e = try_parse_exponent(es)
-            if e.denominator != 1 or e.numerator >= 0:
-                messagebox.showwarning("Input Error", "Exponent must be a negative integer for this rule.")
-                return
-            if not base_is_numeric:
-                result_numeric.config(text="(symbolic only)")
-                return
-            try:
-                numeric = base_num ** float(e)  # e is negative integer
-                result_numeric.config(text=f"{numeric:.12g}")
-            except Exception as ex:
-                messagebox.showerror("Math Error", str(ex))
-            return
-
-        # parse both exponents for other rules
-        e1 = try_parse_exponent(e1_text)
-        e2 = try_parse_exponent(e2_text)
-
-        if rule_code == "power_of_power":
-            res_exp = e1 * e2
-        elif rule_code == "multiply_same_base":
-            res_exp = e1 + e2
-        elif rule_code == "divide_same_base":
-            res_exp = e1 - e2
-        else:
-            messagebox.showerror("Input Error", "Unknown rule.")
-            return
-
-        if not base_is_numeric:
-            result_numeric.config(text="(symbolic only)")
-            return
-
-        # numeric evaluation (use float for fractional exponents)
-        try:
-            numeric = base_num ** float(res_exp)
-            result_numeric.config(text=f"{numeric:.12g}")
-        except ZeroDivisionError:
-            messagebox.showerror("Math Error", "Division by zero in exponent evaluation.")
-        except Exception as ex:
-            messagebox.showerror("Math Error", str(ex))
-
+        numeric = exponent_evaluate(rule_code, base_entry.get(), exp1_entry.get(), exp2_entry.get())
+        result_numeric.config(text=numeric)
+    except MissingInput as e:
+        messagebox.showwarning("Input Error", str(e))
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
-
-# ---------- Algebraic (linear) solver ----------
-def _parse_side_for_var(side: str, var: str):
-    """Return (coeff_sum: Fraction, const_sum: Fraction) for expression side."""
-    side = side.replace('−', '-').replace(' ', '')  # normalize
-    if side == '':
-        return Fraction(0), Fraction(0)
-    tokens = re.findall(r'[+-]?[^+-]+', side)
-    coeff_sum = Fraction(0)
-    const_sum = Fraction(0)
-    for t in tokens:
-        if var in t:
-            # coefficient token e.g. '3x', '-x', '3/2x'
-            coeff_str = t.replace(var, '')
-            if coeff_str in ('', '+'):
-                coeff = Fraction(1)
-            elif coeff_str == '-':
-                coeff = Fraction(-1)
-            else:
-                coeff = parse_number(coeff_str)
-            coeff_sum += coeff
-        else:
-            # constant term
-            const_sum += parse_number(t)
-    return coeff_sum, const_sum
-
-def solve_linear_equation(equation: str):
-    """
-    Solve linear equation in one variable.
-    Supports formats like:
-      2x+3=7
-      -3 1/2x + 4 = x/2 + 1
-      3/4x - 2 = -1/2 x + 5/3
-    Returns tuple (status, message, solution_fraction or None)
-    status: 'unique', 'infinite', 'none', 'error'
-    """
-    try:
-        eq = equation.strip().replace(' ', '')
-        if '=' not in eq:
-            return 'error', "Equation must contain '='.", None
-        left, right = eq.split('=', 1)
-        # detect variable (first alpha char)
-        m = re.search(r'[A-Za-z]', equation)
-        if not m:
-            return 'error', "No variable found in equation.", None
-        var = m.group(0)
-        a_left, b_left = _parse_side_for_var(left, var)
-        a_right, b_right = _parse_side_for_var(right, var)
-        # bring to form (a_left - a_right) * var = (b_right - b_left)
-        a = a_left - a_right
-        b = b_right - b_left
-        if a == 0:
-            if b == 0:
-                return 'infinite', "Infinite solutions (identity).", None
-            else:
-                return 'none', "No solution.", None
-        solution = Fraction(b, a)  # exact rational
-        return 'unique', f"{var} = {solution}", solution
+    except ZeroDivisionError:
+        messagebox.showerror("Math Error", "Division by zero in exponent evaluation.")
     except Exception as ex:
-        return 'error', f"Parse error: {ex}", None
+        messagebox.showerror("Math Error", str(ex))
 
+@instrument
 def on_solve_algebra():
     eq = alg_entry.get().strip()
     if not eq:
         messagebox.showwarning("Input Error", "Enter an equation to solve (e.g. 2x+3=7).")
         return
+    note_text_size(eq)
     status, msg, sol = solve_linear_equation(eq)
     alg_result.config(text=msg)
     if status == 'unique' and sol is not None:
         try:
-            alg_result_decimal.config(text=f"{float(sol):.12g}")
+            alg_result_decimal.config(text=approx_str(sol))
         except Exception:
             alg_result_decimal.config(text="")
     else:
@@ -385,7 +179,11 @@ dark_theme = {
 }
 
 widget_groups = {
+    "frames": [],
+    "canvases": [],
+    "scrollbars": [],
     "labels": [],
+    "results": [],
     "entries": [],
     "buttons": [],
     "optionmenus": [],
@@ -393,96 +191,75 @@ widget_groups = {
 
 is_dark = False
 
-def apply_theme(theme):
-    root.configure(bg=theme["bg"])
-    # canvas and scrollable_frame if present
-    if "canvas" in globals():
-        try:
-            canvas.configure(bg=theme["bg"])
-        except Exception:
-            pass
-    if "scrollable_frame" in globals():
-        try:
-            scrollable_frame.configure(bg=theme["bg"])
-        except Exception:
-            pass
-
-    # apply to known grouped widgets (keeps compatibility)
-    for lbl in widget_groups["labels"]:
-        try:
-            lbl.configure(bg=theme["bg"], fg=theme["fg"])
-        except Exception:
-            pass
-    for ent in widget_groups["entries"]:
-        try:
-            ent.configure(bg=theme["entry_bg"], fg=theme["fg"], insertbackground=theme["fg"])
-        except Exception:
-            pass
-    for btn in widget_groups["buttons"]:
-        try:
-            btn.configure(bg=theme["button_bg"], fg=theme["button_fg"], activebackground=theme["accent"], relief="raised")
-        except Exception:
-            pass
-    for om in widget_groups["optionmenus"]:
-        try:
-            om.configure(bg=theme["button_bg"], fg=theme["button_fg"], activebackground=theme["accent"])
-            om["menu"].configure(bg=theme["entry_bg"], fg=theme["fg"])
-        except Exception:
-            pass
-
-    # Recursively apply background/foreground to all child widgets so entire page uses theme.bg
-    def _recurse_apply(w):
-        try:
-            cls = w.winfo_class()
-            if cls in ("Frame", "Labelframe"):
-                w.configure(bg=theme["bg"])
-            elif cls == "Canvas":
-                w.configure(bg=theme["bg"])
-            elif cls == "Label":
-                w.configure(bg=theme["bg"], fg=theme["fg"])
-            elif cls == "Entry" or cls == "Text":
-                w.configure(bg=theme["entry_bg"], fg=theme["fg"], insertbackground=theme["fg"])
-            elif cls == "Button":
-                w.configure(bg=theme["button_bg"], fg=theme["button_fg"], activebackground=theme["accent"])
-            elif cls == "Scrollbar":
-                # some platforms accept troughcolor, background, etc.
-                try:
-                    w.configure(bg=theme["bg"], troughcolor=theme.get("entry_bg", theme["bg"]))
-                except Exception:
-                    try:
-                        w.configure(bg=theme["bg"])
-                    except Exception:
-                        pass
-            elif cls == "Menubutton":
-                try:
-                    w.configure(bg=theme["button_bg"], fg=theme["button_fg"])
-                    # configure attached menu if present
-                    if hasattr(w, "children") and "menu" in w.children:
-                        try:
-                            w["menu"].configure(bg=theme["entry_bg"], fg=theme["fg"])
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-        for child in w.winfo_children():
-            _recurse_apply(child)
-
-    _recurse_apply(root)
+# configure arguments per registered group, applied in this order so that
+# "results" overrides the plain label colours of the same widgets
+_group_options = (
+    ("frames", "-bg {bg}"),
+    ("canvases", "-bg {bg}"),
+    ("scrollbars", "-bg {bg} -troughcolor {entry_bg}"),
+    ("labels", "-bg {bg} -fg {fg}"),
+    ("results", "-bg {result_bg} -fg {fg}"),
+    ("entries", "-bg {entry_bg} -fg {fg} -insertbackground {fg}"),
+    ("buttons", "-bg {button_bg} -fg {button_fg} -activebackground {accent} -relief raised"),
+    ("optionmenus", "-bg {button_bg} -fg {button_fg} -activebackground {accent}"),
+)
+
+# option database defaults, so widgets created after apply_theme start themed
+_option_db = (
+    ("*Frame.background", "bg"),
+    ("*Canvas.background", "bg"),
+    ("*Label.background", "bg"),
+    ("*Label.foreground", "fg"),
+    ("*Entry.background", "entry_bg"),
+    ("*Entry.foreground", "fg"),
+    ("*Entry.insertBackground", "fg"),
+    ("*Button.background", "button_bg"),
+    ("*Button.foreground", "button_fg"),
+    ("*Button.activeBackground", "accent"),
+    ("*Menubutton.background", "button_bg"),
+    ("*Menubutton.foreground", "button_fg"),
+    ("*Menu.background", "entry_bg"),
+    ("*Menu.foreground", "fg"),
+)
+
+_theme_scripts = {}
+
+def _theme_script(theme, since=None):
+    """One Tcl script that restyles the registered widgets (cached per theme).
+
+    `since` maps group -> list index; only widgets registered after it are
+    included (used when a lazily built section joins the current theme).
+    """
+    key = (id(theme), sum(len(ws) for ws in widget_groups.values()))
+    if since is None:
+        script = _theme_scripts.get(key)
+        if script is not None:
+            return script
+    lines = [f"{root} configure -bg {theme['bg']}"] if since is None else []
+    for group, opts in _group_options:
+        args = opts.format(**theme)
+        for w in dict.fromkeys(widget_groups[group][since[group] if since else 0:]):
+            lines.append(f"catch {{{w} configure {args}}}")
+    for om in dict.fromkeys(widget_groups["optionmenus"][since["optionmenus"] if since else 0:]):
+        lines.append(f"catch {{{om['menu']} configure -bg {theme['entry_bg']} -fg {theme['fg']}}}")
+    script = "\n".join(lines)
+    if since is None:
+        _theme_scripts[key] = script
+    return script
+
+def current_theme():
+    return dark_theme if is_dark else light_theme
 
-    # result labels distinct background (ensure readability)
-    for res in (result_ltog, result_gtol, conv_frac, conv_decimal, conv_percent, sqrt_result, result_expr, result_numeric):
-        try:
-            res.configure(bg=theme["result_bg"], fg=theme["fg"])
-        except Exception:
-            pass
+def apply_theme(theme):
+    for pattern, name in _option_db:
+        root.option_add(pattern, theme[name])
+    # a single Tcl round-trip instead of a Python call per widget
+    root.tk.eval(_theme_script(theme))
 
 def toggle_theme():
     global is_dark
     is_dark = not is_dark
-    apply_theme(dark_theme if is_dark else light_theme)
+    apply_theme(current_theme())
     theme_button.configure(text="Light Mode" if is_dark else "Dark Mode")
 
 # ---------- UI layout (slim & tall + scrollable content) ----------
@@ -495,6 +272,7 @@ root.resizable(True, True)
 # header with prominent theme switch (stays fixed)
 header = tk.Frame(root, padx=12, pady=8)
 header.pack(fill="x")
+widget_groups["frames"].append(header)
 # header bg will be set by apply_theme later
 title = tk.Label(header, text="Number Tools", font=("Segoe UI", 16, "bold"))
 title.pack(side="left")
@@ -504,18 +282,62 @@ theme_button = tk.Button(header, text="Dark Mode", width=12, command=toggle_them
 theme_button.pack(side="right")
 widget_groups["buttons"].append(theme_button)
 
+# numeric precision for sqrt / exponent / algebra / geometry / converter output
+def on_precision_change(*_):
+    choice = precision_var.get()
+    set_precision(None if choice == "Standard" else int(choice))
+
+precision_var = tk.StringVar(root, "Standard")
+precision_menu = tk.OptionMenu(header, precision_var, "Standard", "20", "50", "100", "1000")
+precision_menu.pack(side="right", padx=(0, 8))
+widget_groups["optionmenus"].append(precision_menu)
+precision_label = tk.Label(header, text="Digits:")
+precision_label.pack(side="right")
+widget_groups["labels"].append(precision_label)
+precision_var.trace_add("write", on_precision_change)
+
+# snap parsed inputs to simple rationals (speeds up exact math on long decimals)
+_snap_choices = {
+    "Off": (None, None),
+    "den ≤ 16": (16, None),
+    "den ≤ 1000": (1000, None),
+    "± 1e-6": (None, Fraction(1, 10**6)),
+    "± 1e-9": (None, Fraction(1, 10**9)),
+}
+
+def on_snap_change(*_):
+    set_snap(*_snap_choices[snap_var.get()])
+
+snap_var = tk.StringVar(root, "Off")
+snap_menu = tk.OptionMenu(header, snap_var, *_snap_choices)
+snap_menu.pack(side="right", padx=(0, 8))
+widget_groups["optionmenus"].append(snap_menu)
+snap_label = tk.Label(header, text="Snap:")
+snap_label.pack(side="right")
+widget_groups["labels"].append(snap_label)
+snap_var.trace_add("write", on_snap_change)
+
 # create scrollable area for the rest of the UI
 container = tk.Frame(root)
 container.pack(fill="both", expand=True)
+widget_groups["frames"].append(container)
 
 canvas = tk.Canvas(container, highlightthickness=0)
 vscroll = tk.Scrollbar(container, orient="vertical", command=canvas.yview)
-canvas.configure(yscrollcommand=vscroll.set)
+
+def _on_canvas_scroll(first, last):
+    vscroll.set(first, last)
+    _schedule_visible_check()
+
+canvas.configure(yscrollcommand=_on_canvas_scroll)
 
 vscroll.pack(side="right", fill="y")
 canvas.pack(side="left", fill="both", expand=True)
+widget_groups["canvases"].append(canvas)
+widget_groups["scrollbars"].append(vscroll)
 
 scrollable_frame = tk.Frame(canvas)
+widget_groups["frames"].append(scrollable_frame)
 # put the scrollable_frame into the canvas
 canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
 
@@ -525,6 +347,7 @@ def _on_frame_configure(event):
 def _on_canvas_configure(event):
     # expand the inner frame to the canvas width
     canvas.itemconfig(canvas_window, width=event.width)
+    _schedule_visible_check()
 
 scrollable_frame.bind("<Configure>", _on_frame_configure)
 canvas.bind("<Configure>", _on_canvas_configure)
@@ -536,212 +359,378 @@ def _on_mousewheel(event):
 
 canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
-# now place the UI inside scrollable_frame (was previously root)
-frame_top = tk.Frame(scrollable_frame, padx=12, pady=8)
-frame_top.pack(fill="x")
-tk.Label(frame_top, text="Enter numbers (decimals, fractions, mixed) separated by commas:").pack(anchor="w")
-widget_groups["labels"].append(frame_top.winfo_children()[-1])
+# ---------- Lazily built sections ----------
+# Each tool section gets a header button and an empty placeholder frame; its
+# widgets are only created the first time the placeholder scrolls into view
+# or the section is expanded.
+sections = []
+_visible_check_pending = False
+
+def add_section(title, build, placeholder_height=260):
+    sec = {"title": title, "build": build, "built": False, "expanded": True}
+    sec["header"] = tk.Button(scrollable_frame, text="▾ " + title, anchor="w",
+                              command=lambda: toggle_section(sec), padx=8, pady=2)
+    sec["header"].pack(fill="x", padx=12, pady=(6, 0))
+    widget_groups["buttons"].append(sec["header"])
+    sec["body"] = tk.Frame(scrollable_frame, height=placeholder_height)
+    sec["body"].pack(fill="x")
+    widget_groups["frames"].append(sec["body"])
+    sections.append(sec)
+    return sec
+
+def ensure_section_built(sec):
+    if sec["built"]:
+        return
+    sec["built"] = True
+    since = {group: len(ws) for group, ws in widget_groups.items()}
+    sec["build"](sec["body"])
+    # new widgets already picked up the option database; this covers the rest
+    root.tk.eval(_theme_script(current_theme(), since))
+
+def toggle_section(sec):
+    sec["expanded"] = not sec["expanded"]
+    if sec["expanded"]:
+        ensure_section_built(sec)
+        sec["body"].pack(fill="x", after=sec["header"])
+    else:
+        sec["body"].pack_forget()
+    sec["header"].configure(text=("▾ " if sec["expanded"] else "▸ ") + sec["title"])
+
+def _schedule_visible_check():
+    global _visible_check_pending
+    if not _visible_check_pending:
+        _visible_check_pending = True
+        root.after_idle(_build_visible_sections)
+
+def _build_visible_sections():
+    global _visible_check_pending
+    _visible_check_pending = False
+    top = canvas.canvasy(0)
+    bottom = top + canvas.winfo_height()
+    for sec in sections:
+        if sec["built"] or not sec["expanded"]:
+            continue
+        body = sec["body"]
+        y = body.winfo_y()
+        if y < bottom and y + body.winfo_height() > top:
+            ensure_section_built(sec)
+
+# ---------- Paged result view ----------
+class ResultPager:
+    """Result area for a sorted NumberBatch that renders one page at a time.
+
+    Only PAGE_SIZE spellings are ever joined for display; copy and export
+    stream the full order in chunks instead of building one big string.
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, parent, name):
+        self.name = name
+        self.batch = None
+        self.order = None
+        self.page = 0
+        self.label = tk.Label(parent, text="", anchor="w", justify="left", wraplength=440, padx=6, pady=4, relief="groove")
+        self.label.pack(fill="x")
+        widget_groups["labels"].append(self.label)
+        widget_groups["results"].append(self.label)
+
+        bar = tk.Frame(parent)
+        bar.pack(fill="x")
+        widget_groups["frames"].append(bar)
+        self.prev_btn = tk.Button(bar, text="◂", command=self.prev_page, padx=6)
+        self.prev_btn.pack(side="left")
+        self.next_btn = tk.Button(bar, text="▸", command=self.next_page, padx=6)
+        self.next_btn.pack(side="left")
+        self.status = tk.Label(bar, text="", anchor="w")
+        self.status.pack(side="left", padx=6)
+        self.export_btn = tk.Button(bar, text="Export…", command=self.export, padx=6)
+        self.export_btn.pack(side="right")
+        self.copy_btn = tk.Button(bar, text="Copy", command=self.copy, padx=6)
+        self.copy_btn.pack(side="right")
+        widget_groups["labels"].append(self.status)
+        widget_groups["buttons"].extend((self.prev_btn, self.next_btn, self.export_btn, self.copy_btn))
+
+    def show(self, batch, order):
+        self.batch = batch
+        self.order = order
+        self.page = 0
+        self.render()
+
+    def page_count(self):
+        if not self.order:
+            return 0
+        return (len(self.order) + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+
+    def render(self):
+        if not self.order:
+            self.label.config(text="")
+            self.status.config(text="")
+            return
+        start = self.page * self.PAGE_SIZE
+        stop = min(start + self.PAGE_SIZE, len(self.order))
+        self.label.config(text=", ".join(self.batch.iter_spellings(self.order, start, stop)))
+        if self.page_count() > 1:
+            self.status.config(text=f"{start + 1}–{stop} of {len(self.order)}")
+        else:
+            self.status.config(text="")
+
+    def prev_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self.render()
+
+    def next_page(self):
+        if self.page + 1 < self.page_count():
+            self.page += 1
+            self.render()
+
+    def copy(self):
+        if not self.order:
+            return
+        # Tk concatenates successive clipboard_append calls, so stream chunks
+        root.clipboard_clear()
+        self.batch.write_spellings(self.order, root.clipboard_append)
+
+    def export(self):
+        if not self.order:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".txt", initialfile=self.name + ".txt",
+                                            filetypes=[("Text", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                # one value per line
+                self.batch.write_spellings(self.order, f.write, sep="\n")
+                f.write("\n")
+        except OSError as e:
+            messagebox.showerror("Export Error", str(e))
+
+
+# ---------- Section builders ----------
+def build_sort_section(parent):
+    global entry, result_ltog, result_gtol
+    frame_top = tk.Frame(parent, padx=12, pady=8)
+    frame_top.pack(fill="x")
+    widget_groups["frames"].append(frame_top)
+    tk.Label(frame_top, text="Enter numbers (decimals, fractions, mixed) separated by commas:").pack(anchor="w")
+    widget_groups["labels"].append(frame_top.winfo_children()[-1])
+
+    entry = tk.Entry(frame_top, width=48)
+    entry.pack(pady=6)
+    widget_groups["entries"].append(entry)
+
+    btn_sort = tk.Button(frame_top, text="Sort Numbers", command=on_sort, padx=8, pady=4)
+    btn_sort.pack()
+    widget_groups["buttons"].append(btn_sort)
+
+    tk.Label(frame_top, text="Least → Greatest:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(frame_top.winfo_children()[-1])
+    result_ltog = ResultPager(frame_top, "least_to_greatest")
+
+    tk.Label(frame_top, text="Greatest → Least:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(frame_top.winfo_children()[-1])
+    result_gtol = ResultPager(frame_top, "greatest_to_least")
 
 #calc
-calc_frame = tk.Frame(scrollable_frame, padx=12, pady=8, bd=2, relief="groove")
-calc_frame.pack(fill="x", pady=6)
-
-calc_display = tk.Entry(calc_frame, width=28, font=("Segoe UI", 14), justify="right")
-calc_display.grid(row=0, column=0, columnspan=4, pady=6)
-widget_groups["entries"].append(calc_display)
-
-buttons = [
-    ("7",1,0), ("8",1,1), ("9",1,2), ("/",1,3),
-    ("4",2,0), ("5",2,1), ("6",2,2), ("*",2,3),
-    ("1",3,0), ("2",3,1), ("3",3,2), ("-",3,3),
-    ("0",4,0), (".",4,1), ("C",4,2), ("+",4,3),
-    ("=",5,0,4)  # span 4 columns
-]
-
-for b in buttons:
-    text = b[0]
-    row, col = b[1], b[2]
-    colspan = b[3] if len(b) == 4 else 1
-    btn = tk.Button(calc_frame, text=text, width=6, height=2,
-                    command=lambda t=text: calc_click(t))
-    btn.grid(row=row, column=col, columnspan=colspan, padx=2, pady=2, sticky="nsew")
-    widget_groups["buttons"].append(btn)
-
-# Expand buttons evenly
-for i in range(4):
-    calc_frame.grid_columnconfigure(i, weight=1)
-
-
-# ---------- Then pack your Number Tools frame ----------
-tools_frame = tk.Frame(scrollable_frame, padx=12, pady=8, bd=2, relief="groove")
-tools_frame.pack(fill="x", pady=6)
-
-# Expand buttons evenly
-for i in range(4):
-    calc_frame.grid_columnconfigure(i, weight=1)
-
-entry = tk.Entry(frame_top, width=48)
-entry.pack(pady=6)
-widget_groups["entries"].append(entry)
-
-btn_sort = tk.Button(frame_top, text="Sort Numbers", command=on_sort, padx=8, pady=4)
-btn_sort.pack()
-widget_groups["buttons"].append(btn_sort)
-
-tk.Label(frame_top, text="Least → Greatest:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(frame_top.winfo_children()[-1])
-result_ltog = tk.Label(frame_top, text="", anchor="w", justify="left", wraplength=440, padx=6, pady=4, relief="groove")
-result_ltog.pack(fill="x")
-widget_groups["labels"].append(result_ltog)
-
-tk.Label(frame_top, text="Greatest → Least:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(frame_top.winfo_children()[-1])
-result_gtol = tk.Label(frame_top, text="", anchor="w", justify="left", wraplength=440, padx=6, pady=4, relief="groove")
-result_gtol.pack(fill="x")
-widget_groups["labels"].append(result_gtol)
+def build_calc_section(parent):
+    global calc_display
+    calc_frame = tk.Frame(parent, padx=12, pady=8, bd=2, relief="groove")
+    calc_frame.pack(fill="x", pady=6)
+    widget_groups["frames"].append(calc_frame)
+
+    calc_display = tk.Entry(calc_frame, width=28, font=("Segoe UI", 14), justify="right")
+    calc_display.grid(row=0, column=0, columnspan=4, pady=6)
+    widget_groups["entries"].append(calc_display)
+
+    buttons = [
+        ("7",1,0), ("8",1,1), ("9",1,2), ("/",1,3),
+        ("4",2,0), ("5",2,1), ("6",2,2), ("*",2,3),
+        ("1",3,0), ("2",3,1), ("3",3,2), ("-",3,3),
+        ("0",4,0), (".",4,1), ("C",4,2), ("+",4,3),
+        ("=",5,0,4)  # span 4 columns
+    ]
+
+    for b in buttons:
+        text = b[0]
+        row, col = b[1], b[2]
+        colspan = b[3] if len(b) == 4 else 1
+        btn = tk.Button(calc_frame, text=text, width=6, height=2,
+                        command=lambda t=text: calc_click(t))
+        btn.grid(row=row, column=col, columnspan=colspan, padx=2, pady=2, sticky="nsew")
+        widget_groups["buttons"].append(btn)
+
+    # Expand buttons evenly
+    for i in range(4):
+        calc_frame.grid_columnconfigure(i, weight=1)
+
+    # ---------- Then pack your Number Tools frame ----------
+    tools_frame = tk.Frame(parent, padx=12, pady=8, bd=2, relief="groove")
+    tools_frame.pack(fill="x", pady=6)
+    widget_groups["frames"].append(tools_frame)
 
 # converter section
-sep = tk.Label(scrollable_frame, text="")
-sep.pack(pady=6)
-widget_groups["labels"].append(sep)
-
-frame_conv = tk.Frame(scrollable_frame, padx=12, pady=8)
-frame_conv.pack(fill="x")
-tk.Label(frame_conv, text="Converter (fraction / decimal / percent):").pack(anchor="w")
-widget_groups["labels"].append(frame_conv.winfo_children()[-1])
-
-convert_entry = tk.Entry(frame_conv, width=28)
-convert_entry.pack(pady=6)
-widget_groups["entries"].append(convert_entry)
-
-btn_conv = tk.Button(frame_conv, text="Convert", command=on_convert, padx=8, pady=4)
-btn_conv.pack()
-widget_groups["buttons"].append(btn_conv)
-
-tk.Label(frame_conv, text="As Fraction:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(frame_conv.winfo_children()[-1])
-conv_frac = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
-conv_frac.pack(fill="x")
-widget_groups["labels"].append(conv_frac)
-
-tk.Label(frame_conv, text="As Decimal:").pack(anchor="w", pady=(6,0))
-widget_groups["labels"].append(frame_conv.winfo_children()[-1])
-conv_decimal = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
-conv_decimal.pack(fill="x")
-widget_groups["labels"].append(conv_decimal)
-
-tk.Label(frame_conv, text="As Percent:").pack(anchor="w", pady=(6,0))
-widget_groups["labels"].append(frame_conv.winfo_children()[-1])
-conv_percent = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
-conv_percent.pack(fill="x")
-widget_groups["labels"].append(conv_percent)
+def build_converter_section(parent):
+    global convert_entry, conv_frac, conv_decimal, conv_percent
+    global conv_mixed, conv_sci, conv_nearest
+    frame_conv = tk.Frame(parent, padx=12, pady=8)
+    frame_conv.pack(fill="x")
+    widget_groups["frames"].append(frame_conv)
+    tk.Label(frame_conv, text="Converter (fraction / decimal / percent):").pack(anchor="w")
+    widget_groups["labels"].append(frame_conv.winfo_children()[-1])
+
+    convert_entry = tk.Entry(frame_conv, width=28)
+    convert_entry.pack(pady=6)
+    widget_groups["entries"].append(convert_entry)
+
+    btn_conv = tk.Button(frame_conv, text="Convert", command=on_convert, padx=8, pady=4)
+    btn_conv.pack()
+    widget_groups["buttons"].append(btn_conv)
+
+    tk.Label(frame_conv, text="As Fraction:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(frame_conv.winfo_children()[-1])
+    conv_frac = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
+    conv_frac.pack(fill="x")
+    widget_groups["labels"].append(conv_frac)
+    widget_groups["results"].append(conv_frac)
+
+    tk.Label(frame_conv, text="As Decimal:").pack(anchor="w", pady=(6,0))
+    widget_groups["labels"].append(frame_conv.winfo_children()[-1])
+    conv_decimal = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
+    conv_decimal.pack(fill="x")
+    widget_groups["labels"].append(conv_decimal)
+    widget_groups["results"].append(conv_decimal)
+
+    tk.Label(frame_conv, text="As Percent:").pack(anchor="w", pady=(6,0))
+    widget_groups["labels"].append(frame_conv.winfo_children()[-1])
+    conv_percent = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
+    conv_percent.pack(fill="x")
+    widget_groups["labels"].append(conv_percent)
+    widget_groups["results"].append(conv_percent)
+
+    results = []
+    for text in ("As Mixed Number:", "Scientific:", "Nearest 1/16:"):
+        tk.Label(frame_conv, text=text).pack(anchor="w", pady=(6,0))
+        widget_groups["labels"].append(frame_conv.winfo_children()[-1])
+        result = tk.Label(frame_conv, text="", anchor="w", bg=root["bg"])
+        result.pack(fill="x")
+        widget_groups["labels"].append(result)
+        widget_groups["results"].append(result)
+        results.append(result)
+    conv_mixed, conv_sci, conv_nearest = results
 
 # square root
-frame_sqrt = tk.Frame(scrollable_frame, padx=12, pady=8)
-frame_sqrt.pack(fill="x")
-tk.Label(frame_sqrt, text="Square Root:").pack(anchor="w")
-widget_groups["labels"].append(frame_sqrt.winfo_children()[-1])
-sqrt_entry = tk.Entry(frame_sqrt, width=22)
-sqrt_entry.pack(pady=6)
-widget_groups["entries"].append(sqrt_entry)
-btn_sqrt = tk.Button(frame_sqrt, text="√", command=on_sqrt, width=8)
-btn_sqrt.pack()
-widget_groups["buttons"].append(btn_sqrt)
-tk.Label(frame_sqrt, text="Result:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(frame_sqrt.winfo_children()[-1])
-sqrt_result = tk.Label(frame_sqrt, text="", anchor="w")
-sqrt_result.pack(fill="x")
-widget_groups["labels"].append(sqrt_result)
+def build_sqrt_section(parent):
+    global sqrt_entry, sqrt_result
+    frame_sqrt = tk.Frame(parent, padx=12, pady=8)
+    frame_sqrt.pack(fill="x")
+    widget_groups["frames"].append(frame_sqrt)
+    tk.Label(frame_sqrt, text="Square Root:").pack(anchor="w")
+    widget_groups["labels"].append(frame_sqrt.winfo_children()[-1])
+    sqrt_entry = tk.Entry(frame_sqrt, width=22)
+    sqrt_entry.pack(pady=6)
+    widget_groups["entries"].append(sqrt_entry)
+    btn_sqrt = tk.Button(frame_sqrt, text="√", command=on_sqrt, width=8)
+    btn_sqrt.pack()
+    widget_groups["buttons"].append(btn_sqrt)
+    tk.Label(frame_sqrt, text="Result:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(frame_sqrt.winfo_children()[-1])
+    sqrt_result = tk.Label(frame_sqrt, text="", anchor="w")
+    sqrt_result.pack(fill="x")
+    widget_groups["labels"].append(sqrt_result)
+    widget_groups["results"].append(sqrt_result)
 
 # exponent rule
-frame_exp = tk.Frame(scrollable_frame, padx=12, pady=8)
-frame_exp.pack(fill="x")
-tk.Label(frame_exp, text="Exponent Rule (symbolic):", font=("Segoe UI", 11, "bold")).pack(anchor="w")
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-
-tk.Label(frame_exp, text="Base (number or symbol):").pack(anchor="w")
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-base_entry = tk.Entry(frame_exp, width=28)
-base_entry.pack(pady=4)
-widget_groups["entries"].append(base_entry)
-
-tk.Label(frame_exp, text="Exponent 1:").pack(anchor="w")
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-exp1_entry = tk.Entry(frame_exp, width=14)
-exp1_entry.pack(pady=3)
-widget_groups["entries"].append(exp1_entry)
-
-tk.Label(frame_exp, text="Exponent 2:").pack(anchor="w")
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-exp2_entry = tk.Entry(frame_exp, width=14)
-exp2_entry.pack(pady=3)
-widget_groups["entries"].append(exp2_entry)
-
-# friendly short labels -> internal codes
-rules_map = {
-    "Product Rule": "multiply_same_base",
-    "Quotient Rule": "divide_same_base",
-    "Power Rule": "power_of_power",
-    "Negative Exponent Rule": "negative_exponent",   # <--- added
-}
-rule_var = tk.StringVar(root)
-rule_var.set(next(iter(rules_map.keys())))
-option = tk.OptionMenu(frame_exp, rule_var, *rules_map.keys())
-option.pack(pady=6)
-widget_groups["optionmenus"].append(option)
-
-btn_exp = tk.Button(frame_exp, text="Apply Rule", command=on_exponent_rule, padx=8, pady=4)
-btn_exp.pack()
-widget_groups["buttons"].append(btn_exp)
-
-# new Evaluate button
-btn_eval = tk.Button(frame_exp, text="Evaluate", command=on_exponent_evaluate, padx=8, pady=4)
-btn_eval.pack(pady=(4,0))
-widget_groups["buttons"].append(btn_eval)
-
-tk.Label(frame_exp, text="Resulting Expression:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-result_expr = tk.Label(frame_exp, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
-result_expr.pack(fill="x")
-widget_groups["labels"].append(result_expr)
-
-tk.Label(frame_exp, text="Note: numeric evaluation disabled for exponent rules.").pack(anchor="w", pady=(6,0))
-widget_groups["labels"].append(frame_exp.winfo_children()[-1])
-result_numeric = tk.Label(frame_exp, text="", anchor="w")
-result_numeric.pack(fill="x")
-widget_groups["labels"].append(result_numeric)
+def build_exponent_section(parent):
+    global base_entry, exp1_entry, exp2_entry, rule_var, result_expr, result_numeric
+    frame_exp = tk.Frame(parent, padx=12, pady=8)
+    frame_exp.pack(fill="x")
+    widget_groups["frames"].append(frame_exp)
+    tk.Label(frame_exp, text="Exponent Rule (symbolic):", font=("Segoe UI", 11, "bold")).pack(anchor="w")
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+
+    tk.Label(frame_exp, text="Base (number or symbol):").pack(anchor="w")
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+    base_entry = tk.Entry(frame_exp, width=28)
+    base_entry.pack(pady=4)
+    widget_groups["entries"].append(base_entry)
+
+    tk.Label(frame_exp, text="Exponent 1:").pack(anchor="w")
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+    exp1_entry = tk.Entry(frame_exp, width=14)
+    exp1_entry.pack(pady=3)
+    widget_groups["entries"].append(exp1_entry)
+
+    tk.Label(frame_exp, text="Exponent 2:").pack(anchor="w")
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+    exp2_entry = tk.Entry(frame_exp, width=14)
+    exp2_entry.pack(pady=3)
+    widget_groups["entries"].append(exp2_entry)
+
+    rule_var = tk.StringVar(root)
+    rule_var.set(next(iter(rules_map.keys())))
+    option = tk.OptionMenu(frame_exp, rule_var, *rules_map.keys())
+    option.pack(pady=6)
+    widget_groups["optionmenus"].append(option)
+
+    btn_exp = tk.Button(frame_exp, text="Apply Rule", command=on_exponent_rule, padx=8, pady=4)
+    btn_exp.pack()
+    widget_groups["buttons"].append(btn_exp)
+
+    # new Evaluate button
+    btn_eval = tk.Button(frame_exp, text="Evaluate", command=on_exponent_evaluate, padx=8, pady=4)
+    btn_eval.pack(pady=(4,0))
+    widget_groups["buttons"].append(btn_eval)
+
+    tk.Label(frame_exp, text="Resulting Expression:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+    result_expr = tk.Label(frame_exp, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
+    result_expr.pack(fill="x")
+    widget_groups["labels"].append(result_expr)
+    widget_groups["results"].append(result_expr)
+
+    tk.Label(frame_exp, text="Note: numeric evaluation disabled for exponent rules.").pack(anchor="w", pady=(6,0))
+    widget_groups["labels"].append(frame_exp.winfo_children()[-1])
+    result_numeric = tk.Label(frame_exp, text="", anchor="w")
+    result_numeric.pack(fill="x")
+    widget_groups["labels"].append(result_numeric)
+    widget_groups["results"].append(result_numeric)
 
 # Algebraic solver section
-alg_frame = tk.Frame(scrollable_frame, padx=12, pady=8)
-alg_frame.pack(fill="x")
-tk.Label(alg_frame, text="Algebraic Solver (linear in one variable):").pack(anchor="w")
-widget_groups["labels"].append(alg_frame.winfo_children()[-1])
-
-tk.Label(alg_frame, text="Enter equation (e.g. 2x+3=7):").pack(anchor="w")
-widget_groups["labels"].append(alg_frame.winfo_children()[-1])
-alg_entry = tk.Entry(alg_frame, width=36)
-alg_entry.pack(pady=6)
-widget_groups["entries"].append(alg_entry)
-
-alg_buttons = tk.Frame(alg_frame)
-alg_buttons.pack()
-btn_alg_solve = tk.Button(alg_buttons, text="Solve", command=on_solve_algebra, padx=8, pady=4)
-btn_alg_solve.pack(side="left", padx=6)
-widget_groups["buttons"].append(btn_alg_solve)
-
-alg_result_label = tk.Label(alg_frame, text="Result:", anchor="w")
-alg_result_label.pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(alg_result_label)
-alg_result = tk.Label(alg_frame, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
-alg_result.pack(fill="x")
-widget_groups["labels"].append(alg_result)
-
-alg_result_dec_label = tk.Label(alg_frame, text="As decimal (if exact):", anchor="w")
-alg_result_dec_label.pack(anchor="w", pady=(6,0))
-widget_groups["labels"].append(alg_result_dec_label)
-alg_result_decimal = tk.Label(alg_frame, text="", anchor="w")
-alg_result_decimal.pack(fill="x")
-widget_groups["labels"].append(alg_result_decimal)
+def build_algebra_section(parent):
+    global alg_entry, alg_result, alg_result_decimal
+    alg_frame = tk.Frame(parent, padx=12, pady=8)
+    alg_frame.pack(fill="x")
+    widget_groups["frames"].append(alg_frame)
+    tk.Label(alg_frame, text="Algebraic Solver (linear in one variable):").pack(anchor="w")
+    widget_groups["labels"].append(alg_frame.winfo_children()[-1])
+
+    tk.Label(alg_frame, text="Enter equation (e.g. 2x+3=7):").pack(anchor="w")
+    widget_groups["labels"].append(alg_frame.winfo_children()[-1])
+    alg_entry = tk.Entry(alg_frame, width=36)
+    alg_entry.pack(pady=6)
+    widget_groups["entries"].append(alg_entry)
+
+    alg_buttons = tk.Frame(alg_frame)
+    alg_buttons.pack()
+    widget_groups["frames"].append(alg_buttons)
+    btn_alg_solve = tk.Button(alg_buttons, text="Solve", command=on_solve_algebra, padx=8, pady=4)
+    btn_alg_solve.pack(side="left", padx=6)
+    widget_groups["buttons"].append(btn_alg_solve)
+
+    alg_result_label = tk.Label(alg_frame, text="Result:", anchor="w")
+    alg_result_label.pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(alg_result_label)
+    alg_result = tk.Label(alg_frame, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
+    alg_result.pack(fill="x")
+    widget_groups["labels"].append(alg_result)
+
+    alg_result_dec_label = tk.Label(alg_frame, text="As decimal (if exact):", anchor="w")
+    alg_result_dec_label.pack(anchor="w", pady=(6,0))
+    widget_groups["labels"].append(alg_result_dec_label)
+    alg_result_decimal = tk.Label(alg_frame, text="", anchor="w")
+    alg_result_decimal.pack(fill="x")
+    widget_groups["labels"].append(alg_result_decimal)
 
 # ---------- Geometry solver (extended) ----------
 def on_geom_update_fields(*_):
@@ -806,176 +795,138 @@ def on_geom_update_fields(*_):
         geom_label_p2.config(text="Semi-minor (b):")
         geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
         geom_entry_p3.delete(0, tk.END)
+    elif sel == "Polygon (vertices)":
+        geom_label_p1.config(text="Vertices (x,y; x,y; ...):")
+        geom_label_p2.grid_remove(); geom_entry_p2.grid_remove()
+        geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
+        geom_entry_p2.delete(0, tk.END); geom_entry_p3.delete(0, tk.END)
+    elif sel == "Regular Polygon":
+        geom_label_p1.config(text="Number of sides:")
+        geom_label_p2.config(text="Side length:")
+        geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
+        geom_entry_p3.delete(0, tk.END)
+    elif sel == "Sector":
+        geom_label_p1.config(text="Radius:")
+        geom_label_p2.config(text="Angle (degrees):")
+        geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
+        geom_entry_p3.delete(0, tk.END)
+    elif sel == "Sphere":
+        geom_label_p1.config(text="Radius:")
+        geom_label_p2.grid_remove(); geom_entry_p2.grid_remove()
+        geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
+        geom_entry_p2.delete(0, tk.END); geom_entry_p3.delete(0, tk.END)
+    elif sel in ("Cylinder", "Cone"):
+        geom_label_p1.config(text="Radius:")
+        geom_label_p2.config(text="Height:")
+        geom_label_p3.grid_remove(); geom_entry_p3.grid_remove()
+        geom_entry_p3.delete(0, tk.END)
+    elif sel == "Prism":
+        geom_label_p1.config(text="Base area:")
+        geom_label_p2.config(text="Base perimeter (for surface):")
+        geom_label_p3.config(text="Height:")
     else:
         geom_label_p1.config(text="Param 1:")
         geom_label_p2.config(text="Param 2:")
         geom_label_p3.config(text="Param 3:")
 
+@instrument
 def on_compute_geometry():
     sel = geom_var.get()
     p1 = geom_entry_p1.get().strip()
     p2 = geom_entry_p2.get().strip()
     p3 = geom_entry_p3.get().strip()
+    unit = "" if geom_unit_var.get() == "none" else geom_unit_var.get()
+    out_unit = "" if geom_out_unit_var.get() == "same" else geom_out_unit_var.get()
+    exact = geom_mode_var.get() == "Exact"
+    note_text_size(p1, p2, p3)
     try:
-        # helper to get float from input (uses parse_number)
-        def tof(s):
-            return float(parse_number(s))
-
-        if sel == "Circle":
-            if not p1:
-                messagebox.showwarning("Input Error", "Enter radius.")
-                return
-            r = tof(p1)
-            area = math.pi * r * r
-            circ = 2 * math.pi * r
-            geom_result.config(text=f"Area = {area:.6g}   Circumference = {circ:.6g}")
-        elif sel == "Square":
-            if not p1:
-                messagebox.showwarning("Input Error", "Enter side length.")
-                return
-            s = tof(p1)
-            geom_result.config(text=f"Area = {s*s:.6g}   Perimeter = {4*s:.6g}")
-        elif sel == "Rectangle":
-            if not p1 or not p2:
-                messagebox.showwarning("Input Error", "Enter width and height.")
-                return
-            w = tof(p1); h = tof(p2)
-            area = w * h
-            peri = 2 * (w + h)
-            geom_result.config(text=f"Area = {area:.6g}   Perimeter = {peri:.6g}")
-        elif sel == "Parallelogram":
-            if not p1 or not p3:
-                messagebox.showwarning("Input Error", "Enter base and height (side optional for perimeter).")
-                return
-            base = tof(p1); height = tof(p3)
-            area = base * height
-            if p2:
-                side = tof(p2)
-                peri = 2 * (base + side)
-                geom_result.config(text=f"Area = {area:.6g}   Perimeter = {peri:.6g}")
-            else:
-                geom_result.config(text=f"Area = {area:.6g}   Perimeter = (need side length)")
-        elif sel == "Trapezoid":
-            if not p1 or not p2 or not p3:
-                messagebox.showwarning("Input Error", "Enter both bases and height.")
-                return
-            a = tof(p1); b = tof(p2); h = tof(p3)
-            area = 0.5 * (a + b) * h
-            geom_result.config(text=f"Area = {area:.6g}   Perimeter = (need leg lengths)")
-        elif sel == "Triangle Area":
-            if not p1 or not p2:
-                messagebox.showwarning("Input Error", "Enter base and height.")
-                return
-            b = tof(p1); h = tof(p2)
-            area = 0.5 * b * h
-            geom_result.config(text=f"Area = {area:.6g}")
-        elif sel == "Pythagoras (Hypotenuse)":
-            if not p1 or not p2:
-                messagebox.showwarning("Input Error", "Enter both legs.")
-                return
-            a = tof(p1); b = tof(p2)
-            hyp = math.hypot(a, b)
-            geom_result.config(text=f"Hypotenuse = {hyp:.6g}")
-        elif sel == "Rhombus":
-            if not p1 or not p2:
-                messagebox.showwarning("Input Error", "Enter both diagonals.")
-                return
-            d1 = tof(p1); d2 = tof(p2)
-            area = 0.5 * d1 * d2
-            # side from half-diagonals
-            side = math.hypot(d1/2.0, d2/2.0)
-            peri = 4 * side
-            geom_result.config(text=f"Area = {area:.6g}   Perimeter = {peri:.6g}")
-        elif sel == "Ellipse":
-            if not p1 or not p2:
-                messagebox.showwarning("Input Error", "Enter semi-major (a) and semi-minor (b).")
-                return
-            a = tof(p1); b = tof(p2)
-            area = math.pi * a * b
-            # Ramanujan's approximation for circumference
-            h = ((a - b)**2) / ((a + b)**2) if (a + b) != 0 else 0
-            circ = math.pi * (a + b) * (1 + (3*h)/(10 + math.sqrt(4 - 3*h)))
-            geom_result.config(text=f"Area = {area:.6g}   Circumference ≈ {circ:.6g}")
-        else:
-            geom_result.config(text="Unknown shape.")
+        geom_result.config(text=compute_geometry(sel, p1, p2, p3, exact, unit, out_unit))
+    except MissingInput as e:
+        messagebox.showwarning("Input Error", str(e))
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
     except Exception as ex:
         messagebox.showerror("Math Error", str(ex))
 
-# ---------- Geometry UI (placed in scrollable_frame) ----------
-geom_frame = tk.Frame(scrollable_frame, padx=12, pady=8)
-geom_frame.pack(fill="x")
-tk.Label(geom_frame, text="Geometry Solver:").pack(anchor="w")
-widget_groups["labels"].append(geom_frame.winfo_children()[-1])
-
-tk.Label(geom_frame, text="Shape:").pack(anchor="w")
-widget_groups["labels"].append(geom_frame.winfo_children()[-1])
-geom_var = tk.StringVar(root)
-geom_var.set("Circle")
-geom_options = [
-    "Circle", "Square", "Rectangle", "Parallelogram",
-    "Trapezoid", "Triangle Area", "Pythagoras (Hypotenuse)",
-    "Rhombus", "Ellipse"
-]
-geom_option = tk.OptionMenu(geom_frame, geom_var, *geom_options)
-geom_option.pack(pady=4)
-widget_groups["optionmenus"].append(geom_option)
-
-param_frame = tk.Frame(geom_frame)
-param_frame.pack(fill="x")
-geom_label_p1 = tk.Label(param_frame, text="Param 1:")
-geom_label_p1.grid(row=0, column=0, sticky="w")
-geom_entry_p1 = tk.Entry(param_frame, width=18)
-geom_entry_p1.grid(row=0, column=1, padx=6, pady=4)
-widget_groups["labels"].append(geom_label_p1); widget_groups["entries"].append(geom_entry_p1)
-
-geom_label_p2 = tk.Label(param_frame, text="Param 2:")
-geom_label_p2.grid(row=1, column=0, sticky="w")
-geom_entry_p2 = tk.Entry(param_frame, width=18)
-geom_entry_p2.grid(row=1, column=1, padx=6, pady=4)
-widget_groups["labels"].append(geom_label_p2); widget_groups["entries"].append(geom_entry_p2)
-
-geom_label_p3 = tk.Label(param_frame, text="Param 3:")
-geom_label_p3.grid(row=2, column=0, sticky="w")
-geom_entry_p3 = tk.Entry(param_frame, width=18)
-geom_entry_p3.grid(row=2, column=1, padx=6, pady=4)
-widget_groups["labels"].append(geom_label_p3); widget_groups["entries"].append(geom_entry_p3)
-
-# compute button and result
-btn_geom = tk.Button(geom_frame, text="Compute", command=on_compute_geometry, padx=8, pady=4)
-btn_geom.pack(pady=(4,0))
-widget_groups["buttons"].append(btn_geom)
-
-tk.Label(geom_frame, text="Result:").pack(anchor="w", pady=(8,0))
-widget_groups["labels"].append(geom_frame.winfo_children()[-1])
-geom_result = tk.Label(geom_frame, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
-geom_result.pack(fill="x")
-widget_groups["labels"].append(geom_result)
-
-# hook update when shape changes
-geom_var.trace_add("write", on_geom_update_fields)
-on_geom_update_fields()
-
-# ensure geometry widgets are included in theme groups
-widget_groups["optionmenus"].append(geom_option)
-widget_groups["buttons"].append(btn_geom)
-
-# apply initial theme and start UI
-frame_stats = tk.Frame(scrollable_frame, padx=12, pady=8)
-frame_stats.pack(fill="x")
-
-tk.Label(frame_stats, text="Mean, Median, Range:", font=("Segoe UI", 11, "bold")).pack(anchor="w")
-widget_groups["labels"].append(frame_stats.winfo_children()[-1])
-
-stats_entry = tk.Entry(frame_stats, width=48)
-stats_entry.pack(pady=6)
-widget_groups["entries"].append(stats_entry)
-
-stats_result = tk.Label(frame_stats, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
-stats_result.pack(fill="x")
-widget_groups["labels"].append(stats_result)
-
+# ---------- Geometry UI ----------
+def build_geometry_section(parent):
+    global geom_var, geom_label_p1, geom_entry_p1, geom_label_p2, geom_entry_p2
+    global geom_label_p3, geom_entry_p3, geom_result
+    global geom_mode_var, geom_unit_var, geom_out_unit_var
+    geom_frame = tk.Frame(parent, padx=12, pady=8)
+    geom_frame.pack(fill="x")
+    widget_groups["frames"].append(geom_frame)
+    tk.Label(geom_frame, text="Geometry Solver:").pack(anchor="w")
+    widget_groups["labels"].append(geom_frame.winfo_children()[-1])
+
+    tk.Label(geom_frame, text="Shape:").pack(anchor="w")
+    widget_groups["labels"].append(geom_frame.winfo_children()[-1])
+    geom_var = tk.StringVar(root)
+    geom_var.set("Circle")
+    geom_options = [
+        "Circle", "Square", "Rectangle", "Parallelogram",
+        "Trapezoid", "Triangle Area", "Pythagoras (Hypotenuse)",
+        "Rhombus", "Ellipse", "Polygon (vertices)", "Regular Polygon",
+        "Sector", "Sphere", "Cylinder", "Cone", "Prism"
+    ]
+    geom_option = tk.OptionMenu(geom_frame, geom_var, *geom_options)
+    geom_option.pack(pady=4)
+    widget_groups["optionmenus"].append(geom_option)
+
+    param_frame = tk.Frame(geom_frame)
+    param_frame.pack(fill="x")
+    widget_groups["frames"].append(param_frame)
+    geom_label_p1 = tk.Label(param_frame, text="Param 1:")
+    geom_label_p1.grid(row=0, column=0, sticky="w")
+    geom_entry_p1 = tk.Entry(param_frame, width=18)
+    geom_entry_p1.grid(row=0, column=1, padx=6, pady=4)
+    widget_groups["labels"].append(geom_label_p1); widget_groups["entries"].append(geom_entry_p1)
+
+    geom_label_p2 = tk.Label(param_frame, text="Param 2:")
+    geom_label_p2.grid(row=1, column=0, sticky="w")
+    geom_entry_p2 = tk.Entry(param_frame, width=18)
+    geom_entry_p2.grid(row=1, column=1, padx=6, pady=4)
+    widget_groups["labels"].append(geom_label_p2); widget_groups["entries"].append(geom_entry_p2)
+
+    geom_label_p3 = tk.Label(param_frame, text="Param 3:")
+    geom_label_p3.grid(row=2, column=0, sticky="w")
+    geom_entry_p3 = tk.Entry(param_frame, width=18)
+    geom_entry_p3.grid(row=2, column=1, padx=6, pady=4)
+    widget_groups["labels"].append(geom_label_p3); widget_groups["entries"].append(geom_entry_p3)
+
+    # exact / decimal results and units
+    opts_frame = tk.Frame(geom_frame)
+    opts_frame.pack(fill="x")
+    widget_groups["frames"].append(opts_frame)
+    geom_mode_var = tk.StringVar(root, "Decimal")
+    geom_unit_var = tk.StringVar(root, "none")
+    geom_out_unit_var = tk.StringVar(root, "same")
+    for col, (text, var, choices) in enumerate((
+            ("Mode:", geom_mode_var, ("Decimal", "Exact")),
+            ("Units:", geom_unit_var, ("none",) + tuple(UNITS)),
+            ("Show in:", geom_out_unit_var, ("same",) + tuple(UNITS)))):
+        lbl = tk.Label(opts_frame, text=text)
+        lbl.grid(row=0, column=2 * col, sticky="w")
+        om = tk.OptionMenu(opts_frame, var, *choices)
+        om.grid(row=0, column=2 * col + 1, padx=(2, 8), pady=4)
+        widget_groups["labels"].append(lbl); widget_groups["optionmenus"].append(om)
+
+    # compute button and result
+    btn_geom = tk.Button(geom_frame, text="Compute", command=on_compute_geometry, padx=8, pady=4)
+    btn_geom.pack(pady=(4,0))
+    widget_groups["buttons"].append(btn_geom)
+
+    tk.Label(geom_frame, text="Result:").pack(anchor="w", pady=(8,0))
+    widget_groups["labels"].append(geom_frame.winfo_children()[-1])
+    geom_result = tk.Label(geom_frame, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
+    geom_result.pack(fill="x")
+    widget_groups["labels"].append(geom_result)
+
+    # hook update when shape changes
+    geom_var.trace_add("write", on_geom_update_fields)
+    on_geom_update_fields()
+
+@instrument
 def on_calculate_stats():
     s = stats_entry.get()
     if not s.strip():
@@ -983,7 +934,13 @@ def on_calculate_stats():
         return
     numbers = s.split(',')
     try:
-        mean_val, median_val, range_val = calculate_stats(numbers)
+        with phase("parse"):
+            batch = NumberBatch.from_strings(numbers)
+        note_size(len(batch))
+        if not len(batch):
+            raise ValueError("No valid numbers to calculate stats.")
+        with phase("compute"):
+            mean_val, median_val, range_val = batch.stats()
         stats_result.config(
             text=f"Mean: {fraction_to_decimal_str(mean_val)}\n"
                  f"Median: {fraction_to_decimal_str(median_val)}\n"
@@ -992,9 +949,49 @@ def on_calculate_stats():
     except ValueError as e:
         messagebox.showerror("Input Error", str(e))
 
-btn_stats = tk.Button(frame_stats, text="Calculate Stats", command=on_calculate_stats, padx=8, pady=4)
-btn_stats.pack()
-widget_groups["buttons"].append(btn_stats)
+def build_stats_section(parent):
+    global stats_entry, stats_result
+    frame_stats = tk.Frame(parent, padx=12, pady=8)
+    frame_stats.pack(fill="x")
+    widget_groups["frames"].append(frame_stats)
+
+    tk.Label(frame_stats, text="Mean, Median, Range:", font=("Segoe UI", 11, "bold")).pack(anchor="w")
+    widget_groups["labels"].append(frame_stats.winfo_children()[-1])
+
+    stats_entry = tk.Entry(frame_stats, width=48)
+    stats_entry.pack(pady=6)
+    widget_groups["entries"].append(stats_entry)
+
+    stats_result = tk.Label(frame_stats, text="", anchor="w", justify="left", wraplength=440, relief="groove", padx=6, pady=4)
+    stats_result.pack(fill="x")
+    widget_groups["labels"].append(stats_result)
+
+    btn_stats = tk.Button(frame_stats, text="Calculate Stats", command=on_calculate_stats, padx=8, pady=4)
+    btn_stats.pack()
+    widget_groups["buttons"].append(btn_stats)
+
+add_section("Sort", build_sort_section)
+add_section("Calculator", build_calc_section, placeholder_height=340)
+add_section("Converter", build_converter_section)
+add_section("Square Root", build_sqrt_section, placeholder_height=140)
+add_section("Exponent Rules", build_exponent_section, placeholder_height=420)
+add_section("Algebra", build_algebra_section)
+add_section("Geometry", build_geometry_section)
+add_section("Mean, Median, Range", build_stats_section, placeholder_height=160)
+
+# profiling (NUMBERTOOL_PROFILE=1): F12 prints the handler timings and writes the dump
+def _on_profile_dump(event=None):
+    if NumberProfile.is_enabled():
+        print(NumberProfile.report())
+        print("profile written to", NumberProfile.dump())
+
+root.bind_all("<F12>", _on_profile_dump)
+
+# startup timing hook: time from process start to the first painted frame
+def _on_first_frame():
+    root.update_idletasks()
+    NumberProfile.record_startup(time.perf_counter() - _t_start)
 
 apply_theme(light_theme)
+root.after_idle(_on_first_frame)
 root.mainloop()